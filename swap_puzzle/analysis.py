@@ -0,0 +1,98 @@
+"""
+This is the analysis module. It contains cheap facts about the permutation of a grid: its inversions, parity and cycles,
+which give lower bounds on the number of swaps needed to sort it.
+
+Every swap is a transposition, so it changes the parity of the permutation: the length of any solution has the parity of the permutation,
+and it is at least size minus the number of cycles (a transposition changes the number of cycles by one).
+"""
+
+from math import ceil
+
+
+def count_inversions(values):
+    """
+    Counts the pairs i < j with values[i] > values[j], in O(k log k) with a Fenwick tree.
+
+    Parameters:
+    -----------
+    values: sequence[int]
+        Distinct integers between 1 and len(values).
+    """
+    size = len(values)
+    # tree[i] counts the values already seen in a range of values ending at i
+    tree = [0]*(size + 1)
+    inversions = 0
+    for seen, value in enumerate(values):
+        # the number of values already seen that are at most value
+        i, smaller = value, 0
+        while i > 0:
+            smaller += tree[i]
+            i -= i & -i
+        inversions += seen - smaller
+        i = value
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+
+def relative_permutation(state, goal):
+    """
+    Returns the permutation of state relative to goal: the value in the cell k is replaced by 1 + the cell of this value in goal,
+    so the permutation of goal is the identity.
+    """
+    position = {value: k for k, value in enumerate(goal)}
+    return [position[value] + 1 for value in state]
+
+
+def cycle_decomposition(state, goal):
+    """
+    Returns the cycles of length at least 2 of state relative to goal, as lists of cells (flat indices):
+    in a cycle [k_0, k_1, ...], the tile in the cell k_i belongs in the cell k_{i+1} of goal.
+    """
+    permutation = relative_permutation(state, goal)
+    seen = [False]*len(permutation)
+    cycles = []
+    for k in range(len(permutation)):
+        if seen[k] or permutation[k] == k + 1:
+            continue
+        cycle = []
+        while not seen[k]:
+            seen[k] = True
+            cycle.append(k)
+            k = permutation[k] - 1
+        cycles.append(cycle)
+    return cycles
+
+
+def permutation_parity(state, goal):
+    """
+    Returns the parity (0 or 1) of the number of swaps of any sequence leading from state to goal.
+    """
+    return count_inversions(relative_permutation(state, goal)) % 2
+
+
+def parity_bound(h, parity):
+    """
+    Returns the smallest integer at least h with the given parity: a tighter admissible bound than h
+    when the parity of the remaining number of swaps is known.
+    """
+    bound = ceil(h)
+    return bound + ((bound - parity) & 1)
+
+
+def lower_bound(space, state, goal):
+    """
+    Returns a lower bound of the number of swaps leading from state to goal, the largest of:
+    - size minus the number of cycles (including the fixed cells), since a swap changes it by one,
+    - the inversions divided by 2n - 1, since a horizontal swap changes them by one and a vertical swap by at most 2n - 1,
+    - half the Manhattan distance,
+    rounded up to the parity of the permutation.
+    """
+    permutation = relative_permutation(state, goal)
+    cycles = cycle_decomposition(state, goal)
+    fixed = space.size - sum(len(cycle) for cycle in cycles)
+    transpositions = space.size - len(cycles) - fixed
+    inversions = count_inversions(permutation)
+    manhattan = sum(space.distance[k][target - 1] for k, target in enumerate(permutation))
+    return parity_bound(max(transpositions, inversions/(2*space.n - 1), manhattan/2), inversions % 2)
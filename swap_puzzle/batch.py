@@ -0,0 +1,163 @@
+"""
+This is the batch module. It solves many grids in parallel with a pool of processes.
+
+Usage from the root folder: python swap_puzzle/batch.py input --algorithm astar --timeout 1
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from grid import Grid
+from search import astar, anytime_search, batch_astar, focal_search, ida_star, weighted_astar, Budget, BudgetExhausted
+from solver import Solver
+from state import get_space
+
+
+def run_algorithm(algorithm, m, n, state, budget):
+    """
+    Solves one grid given by its compact state, towards the sorted grid.
+
+    Parameters:
+    -----------
+    algorithm: str
+        One of ALGORITHMS
+    m, n: int
+        The size of the grid
+    state: bytes | tuple[int]
+        The compact state of the grid (see Grid.to_state)
+    budget: Budget
+        Limits the searches
+
+    Output:
+    -------
+    moves: list[tuple[tuple[int]]] | None
+        The swaps in the format [((i1, j1), (i2, j2)), ...]
+    """
+    space = get_space(m, n)
+    if algorithm == "greedy":
+        return Solver(Grid.from_state(m, n, state)).get_solution()
+    if algorithm == "astar":
+        return astar(space, state, space.goal, budget=budget)
+    if algorithm == "batch_astar":
+        return batch_astar(space, state, space.goal, budget=budget)
+    if algorithm == "ida_star":
+        return ida_star(space, state, space.goal, budget=budget)
+    if algorithm == "weighted":
+        return weighted_astar(space, state, space.goal, 1.5, budget=budget)[0]
+    if algorithm == "focal":
+        return focal_search(space, state, space.goal, 1.5, budget=budget)[0]
+    if algorithm == "anytime":
+        # Stops at the end of the budget with the best solution found
+        greedy = Solver(Grid.from_state(m, n, state)).get_solution()
+        for moves in anytime_search(space, state, space.goal, greedy, budget=budget):
+            pass
+        return moves
+    raise Exception(f"unknown algorithm {algorithm}")
+
+
+ALGORITHMS = ["greedy", "astar", "batch_astar", "ida_star", "weighted", "focal", "anytime"]
+
+
+def solve_chunk(chunk, algorithm, timeout):
+    """
+    Solves a chunk of grids in a worker process.
+
+    Parameters:
+    -----------
+    chunk: list[tuple]
+        Tuples (index, m, n, state)
+    algorithm: str
+        One of ALGORITHMS
+    timeout: float | None
+        Time limit for each grid in seconds
+
+    Output:
+    -------
+    results: list[dict]
+        One result per grid, see solve_batch.
+    """
+    results = []
+    for index, m, n, state in chunk:
+        start_time = time.perf_counter()
+        try:
+            moves = run_algorithm(algorithm, m, n, state, Budget(timeout))
+            status = "solved" if moves is not None else "unsolvable"
+        except BudgetExhausted:
+            moves, status = None, "timeout"
+        results.append({"index": index, "m": m, "n": n, "algorithm": algorithm, "status": status,
+                        "moves": moves, "length": None if moves is None else len(moves),
+                        "time": time.perf_counter() - start_time})
+    return results
+
+
+def solve_batch(grids, algorithm="astar", timeout=None, workers=None, chunksize=16):
+    """
+    Solves grids in parallel and iterates over the results as soon as they are available (not in the order of grids).
+
+    The grids are sent to the processes by chunks of chunksize grids, as compact states.
+    At most two chunks per worker are waiting at any time, so grids can be a lazy iterable of any length.
+
+    Parameters:
+    -----------
+    grids: iterable[Grid]
+        The grids to solve
+    algorithm: str
+        One of ALGORITHMS. Default is "astar".
+    timeout: float, optional
+        Time limit for each grid in seconds. Default is no limit.
+    workers: int, optional
+        Number of processes. Default is the number of processors.
+    chunksize: int, optional
+        Number of grids sent to a process at once.
+
+    Output:
+    -------
+    Iterates over dictionaries with the keys index (position in grids), m, n, algorithm,
+    status ("solved", "timeout" or "unsolvable"), moves, length and time (in seconds).
+    """
+    if algorithm not in ALGORITHMS:
+        raise Exception(f"unknown algorithm {algorithm}")
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        pending = set()
+        chunk = []
+        for index, grid in enumerate(grids):
+            chunk.append((index, grid.m, grid.n, grid.to_state()))
+            if len(chunk) == chunksize:
+                pending.add(executor.submit(solve_chunk, chunk, algorithm, timeout))
+                chunk = []
+            while len(pending) >= 2*workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        if chunk:
+            pending.add(executor.submit(solve_chunk, chunk, algorithm, timeout))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def grids_from_directory(directory, pattern="grid*.in"):
+    """
+    Iterates over the grids of the files of directory matching pattern (in the format of Grid.grid_from_file), in alphabetical order.
+    """
+    for file_name in sorted(glob.glob(os.path.join(directory, pattern))):
+        yield Grid.grid_from_file(file_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solves all the grids of a directory and prints one json result per line.")
+    parser.add_argument("directory")
+    parser.add_argument("--pattern", default="grid*.in")
+    parser.add_argument("--algorithm", default="astar", choices=ALGORITHMS)
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=16)
+    args = parser.parse_args()
+    grids = grids_from_directory(args.directory, args.pattern)
+    for result in solve_batch(grids, args.algorithm, args.timeout, args.workers, args.chunksize):
+        print(json.dumps(result))
@@ -0,0 +1,257 @@
+"""
+This is the benchmark module. It runs the solvers on seeded grids of several shapes and scramble depths, writes the results
+as CSV and JSON tables, and compares them to a previous run to catch the performance regressions.
+
+Usage from the root folder: python swap_puzzle/benchmark.py --json bench.json --csv bench.csv --baseline previous.json
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from grid import Grid
+from search import astar, batch_astar, ida_star, weighted_astar, anytime_search, Budget, BudgetExhausted
+from solver import Solver
+from state import get_space
+from stats import SearchStats
+from table import DistanceTable, get_distance_table
+
+
+SHAPES = [(2, 2), (2, 3), (3, 3), (2, 4), (3, 4), (4, 4), (5, 5), (2, 6), (6, 2)]
+# None stands for a uniformly random grid
+DEPTHS = [4, 8, 16, None]
+
+
+def scrambled_grid(m, n, depth, rng):
+    """
+    Returns a grid obtained from the sorted grid by depth random swaps (never undoing the previous one),
+    or a uniformly random grid if depth is None.
+
+    Parameters:
+    -----------
+    m, n: int
+        The size of the grid
+    depth: int | None
+        The number of random swaps
+    rng: random.Random
+        The random generator
+    """
+    space = get_space(m, n)
+    if depth is None:
+        return Grid.from_state(m, n, space.pack(rng.sample(range(1, m*n + 1), m*n)))
+    state, last = space.goal, None
+    for _ in range(depth):
+        k = rng.choice([k for k in range(len(space.swaps)) if k != last])
+        state, last = space.swap(state, k), k
+    return Grid.from_state(m, n, state)
+
+
+def solve(engine, grid, budget, stats):
+    """
+    Solves grid towards the sorted grid with an engine.
+
+    Parameters:
+    -----------
+    engine: str
+        One of ENGINES
+    grid: Grid
+        The grid to solve. It is not modified.
+    budget: Budget
+        Limits the engines that take a budget
+    stats: SearchStats
+        Filled by the engines that record statistics
+
+    Output:
+    -------
+    length: int
+        The number of swaps of the solution found.
+    """
+    space = get_space(grid.m, grid.n)
+    start = grid.to_state()
+    if engine == "greedy":
+        return len(Solver(Grid.from_state(grid.m, grid.n, start)).get_solution(stats=stats))
+    if engine == "bfs_bis":
+        return len(grid.bfs_bis(Grid(grid.m, grid.n), stats=stats)) - 1
+    if engine == "find_best_path":
+        return len(grid.find_best_path()) - 1
+    if engine == "bfs_ter":
+        # the same search as Grid.bfs_ter, with the budget
+        return len(astar(space, start, space.goal, budget=budget, stats=stats))
+    if engine == "ida_star":
+        return len(ida_star(space, start, space.goal, budget=budget, stats=stats))
+    if engine == "batch_astar":
+        return len(batch_astar(space, start, space.goal, budget=budget, stats=stats))
+    if engine == "weighted":
+        return len(weighted_astar(space, start, space.goal, 1.5, budget=budget, stats=stats)[0])
+    if engine == "anytime":
+        greedy = Solver(Grid.from_state(grid.m, grid.n, start)).get_solution()
+        for moves in anytime_search(space, start, space.goal, greedy, budget=budget):
+            pass
+        return len(moves)
+    raise Exception(f"unknown engine {engine}")
+
+
+# name: (largest number of cells, True if the solutions are shortest ones)
+# bfs_bis and find_best_path take no budget, so they are limited to the grids whose state space is small
+ENGINES = {
+    "greedy": (None, False),
+    "bfs_bis": (8, True),
+    "find_best_path": (DistanceTable.max_size, True),
+    "bfs_ter": (None, True),
+    "ida_star": (None, True),
+    "batch_astar": (None, True),
+    "weighted": (None, False),
+    "anytime": (None, False),
+}
+
+
+def run_benchmark(shapes=SHAPES, depths=DEPTHS, count=3, engines=None, time_limit=2.0, node_limit=None, seed=0):
+    """
+    Runs the engines on count seeded grids for each shape and depth.
+
+    Parameters:
+    -----------
+    shapes: list[tuple[int, int]]
+        The shapes (m, n) of the grids
+    depths: list[int | None]
+        The scramble depths (see scrambled_grid)
+    count: int
+        Number of grids for each shape and depth
+    engines: list[str], optional
+        Keys of ENGINES. Default is all of them.
+    time_limit: float, optional
+        Time limit of each run in seconds (for the engines taking a budget).
+    node_limit: int, optional
+        Maximal number of states expanded in each run.
+    seed: int
+        The grids only depend on seed, the shape, the depth and their index.
+
+    Output:
+    -------
+    results: list[dict]
+        One result per run, with the keys shape, depth, index, engine, status ("solved", "timeout" or "skipped"),
+        time (seconds), nodes (expanded states), memory (estimate in bytes, see stats.SearchStats), length,
+        optimal (length of a shortest solution if known) and ratio (length/optimal).
+    """
+    engines = list(ENGINES) if engines is None else engines
+    results = []
+    for m, n in shapes:
+        for depth in depths:
+            for index in range(count):
+                grid = scrambled_grid(m, n, depth, random.Random(f"{seed}-{m}x{n}-{depth}-{index}"))
+                case = {"shape": f"{m}x{n}", "depth": depth, "index": index}
+                runs = [dict(case, **run_engine(name, grid, time_limit, node_limit)) for name in engines]
+                # a shortest length: from the distance table if it exists, else from an optimal engine that finished
+                optimal = None
+                if m*n <= DistanceTable.max_size:
+                    optimal = get_distance_table(m, n).distance(grid.to_state())
+                else:
+                    lengths = [run["length"] for run in runs if run["status"] == "solved" and ENGINES[run["engine"]][1]]
+                    optimal = min(lengths) if lengths else None
+                for run in runs:
+                    run["optimal"] = optimal
+                    run["ratio"] = run["length"]/optimal if run["length"] is not None and optimal else None
+                results += runs
+    return results
+
+
+def run_engine(name, grid, time_limit, node_limit):
+    """
+    Runs one engine on grid and returns the fields of its result (see run_benchmark).
+    """
+    max_size = ENGINES[name][0]
+    result = {"engine": name, "status": "skipped", "time": None, "nodes": None, "memory": None, "length": None}
+    if max_size is not None and grid.m*grid.n > max_size:
+        return result
+    budget = Budget(time_limit, node_limit)
+    stats = SearchStats()
+    start_time = time.perf_counter()
+    try:
+        result["length"] = solve(name, grid, budget, stats)
+        result["status"] = "solved"
+    except BudgetExhausted:
+        result["status"] = "timeout"
+    result["time"] = time.perf_counter() - start_time
+    result["nodes"] = stats.expanded or budget.nodes
+    result["memory"] = stats.memory or None
+    return result
+
+
+def write_csv(results, file_name):
+    """
+    Writes the results of run_benchmark as a CSV table.
+    """
+    fields = ["shape", "depth", "index", "engine", "status", "time", "nodes", "memory", "length", "optimal", "ratio"]
+    with open(file_name, "w", newline="") as file:
+        writer = csv.DictWriter(file, fields)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def write_json(results, file_name):
+    """
+    Writes the results of run_benchmark as a JSON list.
+    """
+    with open(file_name, "w") as file:
+        json.dump(results, file, indent=1)
+
+
+def compare(results, baseline, time_factor=1.5, time_slack=0.01, node_factor=1.1):
+    """
+    Compares the results of run_benchmark to those of a previous run, and returns the regressions as messages.
+
+    A run regresses when it does not solve a grid solved in the baseline, when its solution is longer,
+    when it expands more than node_factor times the states, or when it takes more than time_factor times the time plus time_slack
+    (the slack avoids flagging the noise on very short runs).
+    """
+    previous = {(run["shape"], run["depth"], run["index"], run["engine"]): run for run in baseline}
+    regressions = []
+    for run in results:
+        old = previous.get((run["shape"], run["depth"], run["index"], run["engine"]))
+        if old is None or old["status"] != "solved":
+            continue
+        name = f'{run["engine"]} on {run["shape"]} depth {run["depth"]} #{run["index"]}'
+        if run["status"] != "solved":
+            regressions.append(f'{name}: {run["status"]} (solved in the baseline)')
+            continue
+        if run["length"] > old["length"]:
+            regressions.append(f'{name}: length {run["length"]} > {old["length"]}')
+        if old["nodes"] and run["nodes"] > node_factor*old["nodes"]:
+            regressions.append(f'{name}: {run["nodes"]} nodes > {node_factor} x {old["nodes"]}')
+        if run["time"] > time_factor*old["time"] + time_slack:
+            regressions.append(f'{name}: {run["time"]:.4f}s > {time_factor} x {old["time"]:.4f}s')
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the solvers on seeded grids.")
+    parser.add_argument("--shapes", nargs="*", default=[f"{m}x{n}" for m, n in SHAPES])
+    parser.add_argument("--depths", nargs="*", default=["4", "8", "16", "random"])
+    parser.add_argument("--count", type=int, default=3)
+    parser.add_argument("--engines", nargs="*", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--time-limit", type=float, default=2.0)
+    parser.add_argument("--node-limit", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--json", default=None)
+    parser.add_argument("--baseline", default=None, help="json results of a previous run")
+    parser.add_argument("--time-factor", type=float, default=1.5)
+    parser.add_argument("--node-factor", type=float, default=1.1)
+    args = parser.parse_args()
+    shapes = [tuple(map(int, shape.split("x"))) for shape in args.shapes]
+    depths = [None if depth == "random" else int(depth) for depth in args.depths]
+    results = run_benchmark(shapes, depths, args.count, args.engines, args.time_limit, args.node_limit, args.seed)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.json:
+        write_json(results, args.json)
+    for run in results:
+        print(json.dumps(run))
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.time_factor, node_factor=args.node_factor)
+        for message in regressions:
+            print("REGRESSION", message, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,160 @@
+"""
+This is the cache module. It keeps the solutions of the grids already solved, in memory and optionally on disk.
+"""
+
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from grid import Grid
+from solver import Solver
+
+
+# The algorithms that can be cached: each one solves a grid towards the sorted grid without modifying it
+ALGORITHMS = {
+    "bfs_ter": lambda grid: grid.bfs_ter(Grid(grid.m, grid.n)),
+    "ida_star": lambda grid: grid.ida_star(Grid(grid.m, grid.n)),
+    "greedy": lambda grid: Solver(Grid(grid.m, grid.n, [line[:] for line in grid.state])).get_solution(),
+}
+
+
+class SolutionCache:
+    """
+    A cache of solutions (lists of swaps towards the sorted grid), keyed by the algorithm and the state of the grid given by make_hashable.
+
+    The first tier is an LRU dictionary in memory. The optional second tier is a sqlite file, whose least recently used
+    solutions are evicted when the total size of the stored solutions exceeds max_disk_size.
+
+    Attributes:
+    -----------
+    capacity: int
+        Maximal number of solutions in memory.
+    memory: OrderedDict
+        The solutions in memory, from the least to the most recently used.
+    file_name: str | None
+        The sqlite file of the second tier. None for a cache in memory only.
+    max_disk_size: int
+        Maximal total size in bytes of the solutions stored on disk.
+    hits: int
+        Number of solutions found in the cache.
+    misses: int
+        Number of solutions not found in the cache.
+    """
+
+    def __init__(self, capacity=10000, file_name=None, max_disk_size=100*2**20):
+        """
+        Parameters:
+        -----------
+        capacity: int, optional
+            Maximal number of solutions in memory.
+        file_name: str, optional
+            The sqlite file of the second tier (created if needed). Default is no second tier.
+        max_disk_size: int, optional
+            Maximal total size in bytes of the solutions on disk. Default is 100 MB.
+        """
+        self.capacity = capacity
+        self.memory = OrderedDict()
+        self.file_name = file_name
+        self.max_disk_size = max_disk_size
+        self.hits = 0
+        self.misses = 0
+        self.connection = None
+        if file_name is not None:
+            self.connection = sqlite3.connect(file_name)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, moves TEXT, size INTEGER, last_used REAL)")
+            self.connection.commit()
+
+    def __repr__(self):
+        """
+        Returns a representation of the cache with its number of solutions in memory.
+        """
+        return f"<cache.SolutionCache: {len(self.memory)} solutions in memory, file_name={self.file_name}>"
+
+    def __len__(self):
+        """
+        Returns the number of solutions in memory.
+        """
+        return len(self.memory)
+
+    @staticmethod
+    def key(grid, algorithm):
+        """
+        Returns the key of the solution of grid by algorithm.
+        """
+        return (algorithm, grid.make_hashable())
+
+    def get(self, grid, algorithm):
+        """
+        Returns the cached solution of grid by algorithm, or None if it is not in the cache.
+        """
+        key = self.key(grid, algorithm)
+        moves = self.memory.get(key)
+        if moves is not None:
+            self.memory.move_to_end(key)
+        elif self.connection is not None:
+            row = self.connection.execute("SELECT moves FROM solutions WHERE key = ?", (repr(key),)).fetchone()
+            if row is not None:
+                self.connection.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), repr(key)))
+                self.connection.commit()
+                moves = [tuple(tuple(cell) for cell in move) for move in json.loads(row[0])]
+                self.remember(key, moves)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(moves)
+
+    def put(self, grid, algorithm, moves):
+        """
+        Stores the solution moves of grid by algorithm.
+        """
+        key = self.key(grid, algorithm)
+        moves = [tuple(tuple(cell) for cell in move) for move in moves]
+        self.remember(key, moves)
+        if self.connection is not None:
+            data = json.dumps(moves)
+            self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)", (repr(key), data, len(data), time.time()))
+            self.evict_disk()
+            self.connection.commit()
+
+    def remember(self, key, moves):
+        """
+        Puts a solution in memory, evicting the least recently used one if the capacity is exceeded.
+        """
+        self.memory[key] = moves
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def evict_disk(self):
+        """
+        Deletes the least recently used solutions on disk until their total size is at most max_disk_size.
+        """
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+        if total <= self.max_disk_size:
+            return
+        for key, size in self.connection.execute("SELECT key, size FROM solutions ORDER BY last_used").fetchall():
+            if total <= self.max_disk_size:
+                break
+            self.connection.execute("DELETE FROM solutions WHERE key = ?", (key,))
+            total -= size
+
+    def solve(self, grid, algorithm="bfs_ter"):
+        """
+        Returns the solution of grid by algorithm (a key of ALGORITHMS) from the cache, or computes and stores it.
+        The grid is not modified.
+        """
+        moves = self.get(grid, algorithm)
+        if moves is None:
+            moves = ALGORITHMS[algorithm](grid)
+            if moves is not None:
+                self.put(grid, algorithm, moves)
+        return moves
+
+    def close(self):
+        """
+        Closes the sqlite file.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
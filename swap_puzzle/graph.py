@@ -2,6 +2,10 @@
 This is the graph module. It contains a minimalistic Graph class.
 """
 
+from array import array
+from collections import deque
+from loader import read_lines
+
 
 class Graph:
     """
@@ -85,12 +89,22 @@ class Graph:
 
 
     
+    def neighbors(self, node):
+        """
+        Returns the list of the neighbors of node, read from the adjacency lists.
+        Subclasses can override this method to generate the neighbors differently (see ImplicitGraph).
+        """
+        return self.graph[node]
+
+    
     """ 
     Question 5 : Algorithme de parcours en largeur
     """
-    def bfs(self, node_1, node_2): 
+    def bfs(self, node_1, node_2, stats=None): 
         """
         Finds a shortest path from src to dst by BFS.  
+        Each node is stored once in the queue and remembers the node it was reached from, 
+        so the complexity is O(V + E) in time and O(V) in memory.
 
         Parameters: 
         -----------
@@ -98,57 +112,54 @@ class Graph:
             The source node.
         dst: NodeType
             The destination node.
+        stats: SearchStats, optional
+            Filled with the statistics of the search (see the stats module).
 
         Output: 
         -------
         path: list[NodeType] | None
             The shortest path from src to dst. Returns None if dst is not reachable from src
         """ 
-        list_visited = set()
-        list_visited.add(node_1)
-
-        def find_neighbors(edges, node):
-            """The graph should be unoriented but the edges are stored as tuples (node1, node2)
-            and do not necessarily contain both (node1, node2) and (node2, node1)."""
-            #filters edges where the first node matches the given node
-            edges_out = [edge for edge in edges if edge[0] == node and edge[1] not in list_visited]
-            # Extracts second nodes to get the neighbors
-            neighbors = [edge[1] for edge in edges_out]
-            
-            #filters edges where the second node matches the given node
-            edges_in = [edge for edge in edges if edge[1] == node and edge[0] not in list_visited]
-            # Extracts first nodes to get the neighbors
-            neighbors += [edge[0] for edge in edges_in]
-            return neighbors
-        if node_1 == node_2:
-            return [node_1]
-        # Start with paths that are just direct edges from node_1.
-        list_paths = []
-        for edge in self.edges:
-            if edge[0] == node_1:
-                if edge[0] == node_1:
-                    list_paths.append((edge[0], edge[1]))
-                    list_visited.add(edge[1])
-                if edge[1] == node_1:
-                    list_paths.append((edge[1], edge[0]))
-                    list_visited.add(edge[0])
-
-        list_paths += [(edge[1], edge[0]) for edge in self.edges if edge[1] == node_1]
-
-        found = False
-        while not found:
-            new_paths = []
-            # Iterate through all current paths
-            for path in list_paths:
-                if path[-1] == node_2:
-                    # Found it! Return the distance and the path
-                    return path
-                else:
-                    # Extend each path by one neighbor and store these new paths.
-                    path_neighbors = find_neighbors(self.edges, path[-1])
-                    new_paths += [path + (new_node,) for new_node in path_neighbors]
-            list_paths = new_paths
-            
+        if stats is not None:
+            stats.start("bfs")
+            # the depth of each node, only needed for the statistics
+            depths = {node_1: 0}
+        # parents[node] is the node from which node was first reached
+        parents = {node_1: node_1}
+        queue = deque([node_1])
+        path = [node_1] if node_1 == node_2 else None
+
+        while queue and path is None:
+            node = queue.popleft()
+            neighbors = self.neighbors(node)
+            if stats is not None:
+                stats.expand(depths[node], len(queue))
+                stats.generated += len(neighbors)
+            for new_node in neighbors:
+                if new_node not in parents:
+                    parents[new_node] = node
+                    if stats is not None:
+                        depths[new_node] = depths[node] + 1
+                    if new_node == node_2:
+                        # Found it! Go back up to node_1 to build the path
+                        path = [new_node]
+                        while new_node != node_1:
+                            new_node = parents[new_node]
+                            path.append(new_node)
+                        path = tuple(reversed(path))
+                        break
+                    queue.append(new_node)
+        if stats is not None:
+            stats.duplicates = stats.generated - (len(parents) - 1)
+            stats.finish(len(parents), node_1, None if path is None else len(path) - 1)
+        return path
+
+    def compile(self):
+        """
+        Returns a frozen copy of the graph in compressed sparse row format (see CSRGraph). 
+        The neighbors keep the order of the adjacency lists, so searches give the same results.
+        """
+        return CSRGraph.from_graph(self)
 
 
     @classmethod
@@ -171,16 +182,191 @@ class Graph:
         graph: Graph
             An object of the class Graph with the graph from file_name.
         """
-        with open(file_name, "r") as file:
-            n, m = map(int, file.readline().split())
-            graph = Graph(range(1, n+1))
-            for _ in range(m):
-                edge = list(map(int, file.readline().split()))
-                if len(edge) == 2:
-                    node1, node2 = edge
-                    graph.add_edge(node1, node2) # will add dist=1 by default
-                else:
-                    raise Exception("Format incorrect")
+        lines = read_lines(file_name)
+        if not lines or len(lines[0]) != 2:
+            raise Exception("Format incorrect")
+        n, m = lines[0]
+        if m < 0 or len(lines) < 1 + m or any(lines[1 + m:]):
+            raise Exception("Format incorrect")
+        graph = Graph(list(range(1, n+1)))
+        # Build the adjacency lists in one pass, without calling add_edge for each line
+        adjacency = graph.graph
+        edges = []
+        for edge in lines[1:1 + m]:
+            if len(edge) != 2:
+                raise Exception("Format incorrect")
+            node1, node2 = edge
+            if not (1 <= node1 <= n and 1 <= node2 <= n):
+                raise Exception("Format incorrect")
+            edges.append((node1, node2))
+            adjacency[node1].append(node2)
+            adjacency[node2].append(node1)
+        graph.edges = edges
+        graph.nb_edges = m
         return graph
     
     
+
+
+
+class CSRGraph:
+    """
+    A frozen undirected graph stored in compressed sparse row format: nodes are numbered 0..nb_nodes-1 
+    and all the adjacency lists are concatenated in a single array of integers.
+    It takes a few bytes per edge instead of the tuples and lists of Graph, and it is built with Graph.compile.
+
+    Attributes: 
+    -----------
+    nodes: list[NodeType]
+        The nodes, nodes[i] being the node of index i.
+    node_index: dict
+        The index of each node, such that nodes[node_index[node]] == node.
+    offsets: array
+        The neighbors of the node of index i are targets[offsets[i]:offsets[i+1]].
+    targets: array
+        The indices of the neighbors of all nodes, one adjacency list after the other.
+    nb_nodes: int
+        The number of nodes.
+    nb_edges: int
+        The number of edges. 
+    """
+
+    def __init__(self, nodes, offsets, targets, nb_edges):
+        """
+        Initializes the graph from its arrays. Use CSRGraph.from_graph to build it from a Graph.
+        """
+        self.nodes = list(nodes)
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.offsets = offsets
+        self.targets = targets
+        self.nb_nodes = len(self.nodes)
+        self.nb_edges = nb_edges
+
+    def __repr__(self): 
+        """
+        Returns a representation of the graph with number of nodes and edges.
+        """
+        return f"<graph.CSRGraph: nb_nodes={self.nb_nodes}, nb_edges={self.nb_edges}>"
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Builds the compressed representation of a Graph from its adjacency lists.
+        """
+        nodes = list(graph.graph)
+        node_index = {node: i for i, node in enumerate(nodes)}
+        offsets = array("l", [0])
+        targets = array("l")
+        for node in nodes:
+            targets.extend(node_index[neighbor] for neighbor in graph.graph[node])
+            offsets.append(len(targets))
+        return cls(nodes, offsets, targets, graph.nb_edges)
+
+    def neighbors(self, node):
+        """
+        Returns the list of the neighbors of node.
+        """
+        i = self.node_index[node]
+        nodes = self.nodes
+        return [nodes[k] for k in self.targets[self.offsets[i]:self.offsets[i+1]]]
+
+    def bfs(self, node_1, node_2):
+        """
+        Finds a shortest path from src to dst by BFS on the node indices. Same output as Graph.bfs.
+
+        Parameters: 
+        -----------
+        src: NodeType
+            The source node.
+        dst: NodeType
+            The destination node.
+
+        Output: 
+        -------
+        path: list[NodeType] | None
+            The shortest path from src to dst. Returns None if dst is not reachable from src
+        """
+        if node_1 == node_2:
+            return [node_1]
+        source = self.node_index[node_1]
+        destination = self.node_index[node_2]
+        offsets, targets = self.offsets, self.targets
+        # parents[k] is the index of the node from which k was first reached, -1 if not reached yet
+        parents = array("l", [-1]) * self.nb_nodes
+        parents[source] = source
+        queue = deque([source])
+
+        while queue:
+            i = queue.popleft()
+            for k in targets[offsets[i]:offsets[i+1]]:
+                if parents[k] < 0:
+                    parents[k] = i
+                    if k == destination:
+                        path = [k]
+                        while k != source:
+                            k = parents[k]
+                            path.append(k)
+                        return tuple(self.nodes[k] for k in reversed(path))
+                    queue.append(k)
+        return None
+
+    def distances(self, node):
+        """
+        Computes the length of the shortest paths from node to all the nodes by BFS.
+
+        Output: 
+        -------
+        distances: array
+            distances[i] is the distance from node to nodes[i], -1 if nodes[i] is not reachable.
+        """
+        source = self.node_index[node]
+        offsets, targets = self.offsets, self.targets
+        distances = array("l", [-1]) * self.nb_nodes
+        distances[source] = 0
+        queue = deque([source])
+        while queue:
+            i = queue.popleft()
+            for k in targets[offsets[i]:offsets[i+1]]:
+                if distances[k] < 0:
+                    distances[k] = distances[i] + 1
+                    queue.append(k)
+        return distances
+
+
+class ImplicitGraph(Graph):
+    """
+    A graph whose adjacency lists are not stored but generated on demand, 
+    so that only the nodes actually reached by a search are ever built.
+    It can be used everywhere a Graph is traversed through Graph.neighbors (e.g. Graph.bfs).
+
+    Attributes: 
+    -----------
+    neighbors_function: function
+        neighbors_function(node) returns an iterable over the neighbors of node.
+    """
+
+    def __init__(self, neighbors_function, nodes=[]):
+        """
+        Initializes the graph. 
+
+        Parameters: 
+        -----------
+        neighbors_function: function
+            A function that returns the neighbors of a node.
+        nodes: list, optional
+            The nodes known in advance (e.g. the source of a search). Default is empty.
+        """
+        super().__init__(list(nodes))
+        self.neighbors_function = neighbors_function
+
+    def __repr__(self): 
+        """
+        Returns a representation of the graph with the number of nodes known in advance.
+        """
+        return f"<graph.ImplicitGraph: nb_nodes={self.nb_nodes}>"
+
+    def neighbors(self, node):
+        """
+        Returns the neighbors of node, generated by neighbors_function.
+        """
+        return self.neighbors_function(node)
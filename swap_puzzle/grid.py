@@ -6,10 +6,18 @@ import random
 import pygame
 from collections import deque
 import math 
+from numbers import Integral
 import matplotlib.pyplot as plt 
-from graph import Graph
-from heapq import heappop, heappush
-import copy
+from graph import Graph, ImplicitGraph
+from state import get_space, rebuild_path
+from loader import read_lines
+from parallel import parallel_bfs
+from search import astar, bidirectional_bfs, focal_search, ida_star, weighted_astar
+from heuristics import HEURISTICS, sorted_heuristic
+from table import DistanceTable, get_distance_table
+from ranking import rank, unrank, rank_batch, unrank_batch
+from analysis import count_inversions, cycle_decomposition, lower_bound
+from moves import is_sorted_batch
 
 
 class GridVisualizer: # Defines a class to visualize a grid using Pygame
@@ -158,18 +166,28 @@ class Grid():
     def is_sorted(self):
         """
         Checks if the current state of the grid is sorted and returns the answer as a boolean.
+        The grid contains the numbers 1..m*n, so it is sorted when it is equal to the precomputed sorted state of its shape.
+        The lines may also be tuples (or the state a tuple), so they are converted to lists when the single comparison fails.
         """
-        # Check if the numbers in each line are sorted
-        for i in range(self.m):
-            for j in range(self.n - 1):
-                if self.state[i][j] > self.state[i][j+1]:
-                    return False
-                
-        # Check if the jumps from one line to the next preserve the order
-        for i in range(0, self.m - 1):
-            if self.state[i][-1] > self.state[i+1][0]:
-                return False
-        return True
+        goal_lines = get_space(self.m, self.n).goal_lines
+        return self.state == goal_lines or list(map(list, self.state)) == goal_lines
+
+    @staticmethod
+    def is_sorted_batch(states):
+        """
+        Checks if many grids of the same shape are sorted at once (see moves.is_sorted_batch).
+
+        Parameters: 
+        -----------
+        states: np.ndarray | list
+            The states of the grids, of shape (k, m, n) or flattened (k, m*n).
+
+        Output: 
+        -------
+        sorted: np.ndarray
+            Array of k booleans.
+        """
+        return is_sorted_batch(states)
 
     
     def swap(self, cell1, cell2):
@@ -192,7 +210,9 @@ class Grid():
     
     def swap_seq(self, cell_pair_list):
         """
-        Executes a sequence of swaps. 
+        Executes a sequence of swaps. The whole sequence is validated first: 
+        if a swap is not allowed, an exception giving its index is raised and the grid is not modified.
+        (To check many sequences at once, see moves.verify_solutions.)
 
         Parameters: 
         -----------
@@ -200,8 +220,19 @@ class Grid():
             List of swaps, each swap being a tuple of two cells (each cell being a tuple of integers). 
             So the format should be [((i1, j1), (i2, j2)), ((i1', j1'), (i2', j2')), ...].
         """
-        for cell_1, cell_2 in cell_pair_list:
-            self.swap(cell_1, cell_2)
+        m, n = self.m, self.n
+        for index, ((i1, j1), (i2, j2)) in enumerate(cell_pair_list):
+            if not (type(i1) is int and type(j1) is int and type(i2) is int and type(j2) is int):
+                # other integer types, e.g. the NumPy ones, are accepted, but not the bools, floats...
+                if not all(isinstance(k, Integral) and not isinstance(k, bool) for k in (i1, j1, i2, j2)):
+                    raise Exception(f"the cells of the swap {index} are not pairs of integers")
+            if not (0 <= i1 < m and 0 <= i2 < m and 0 <= j1 < n and 0 <= j2 < n):
+                raise Exception(f"a cell of the swap {index} is outside the grid")
+            if abs(i1 - i2) + abs(j1 - j2) != 1:
+                raise Exception(f"the two cells of the swap {index} are not next to each other")
+        state = self.state
+        for (i1, j1), (i2, j2) in cell_pair_list:
+            state[i1][j1], state[i2][j2] = state[i2][j2], state[i1][j1]
         return self
 
         
@@ -233,6 +264,72 @@ class Grid():
         tuple_tuples = tuple(list_tuples)
         return tuple_tuples
 
+    def to_state(self):
+        """
+        Returns the compact (flat, hashable) encoding of the grid used by the search algorithms. See state.StateSpace.
+        """
+        return get_space(self.m, self.n).encode(self.state)
+
+    @classmethod
+    def from_state(cls, m, n, state):
+        """
+        Creates a grid from its compact encoding (the inverse of to_state).
+
+        Parameters: 
+        -----------
+        m: int
+            Number of lines in the grid
+        n: int
+            Number of columns in the grid
+        state: bytes | tuple[int]
+            The flat state, as returned by to_state
+        """
+        return cls(m, n, get_space(m, n).decode(state))
+
+    def rank(self):
+        """
+        Returns the rank of the grid among the (m*n)! states, an index in flat arrays. See ranking.rank.
+        """
+        return rank(self.to_state())
+
+    @classmethod
+    def from_rank(cls, m, n, index):
+        """
+        Creates the grid of the given rank (the inverse of rank). See ranking.unrank.
+        """
+        return cls.from_state(m, n, get_space(m, n).pack(unrank(index, m*n)))
+
+    """
+    Pre-analysis of the permutation of the grid (see the analysis module), to bound the length of the solutions before searching.
+    """
+
+    def inversions(self):
+        """
+        Returns the number of pairs of tiles in the wrong order when the grid is read line by line, in O(k log k).
+        """
+        return count_inversions(self.to_state())
+
+    def parity(self):
+        """
+        Returns the parity (0 or 1) of the number of swaps of any solution.
+        """
+        return self.inversions() % 2
+
+    def cycles(self):
+        """
+        Returns the cycles of the permutation of the grid, as lists of cells [(i, j), ...]:
+        the tile in each cell of a cycle belongs in the next cell.
+        """
+        space = get_space(self.m, self.n)
+        return [[(k // self.n, k % self.n) for k in cycle] for cycle in cycle_decomposition(self.to_state(), space.goal)]
+
+    def lower_bound(self):
+        """
+        Returns a lower bound of the number of swaps needed to sort the grid. See analysis.lower_bound.
+        """
+        space = get_space(self.m, self.n)
+        return lower_bound(space, self.to_state(), space.goal)
+
 
     """ 
     Question 7 : creation de bfs pour le swapp_puzzle
@@ -264,40 +361,49 @@ class Grid():
         if not hasattr(self, "path_graph"): # Checks if path_graph attribute exists in the object; if not, it initializes it
             self.path_graph = Graph(self.grids_graph()) #Creates a Graph with all possible grid states.
         nodes = self.path_graph.nodes
-        from copy import deepcopy # to copy the grid to make transpositions possible
-        m = len(nodes[0])
-        n = len(nodes[0][0])
-        list_transpositions = [((i,j),(i,j+1)) for i in range(m) for j in range(n-1)] + [((i,j),(i+1,j)) for i in range(m-1) for j in range(n)] #Creates a list of all possible cell swaps (transpositions) within the grid
+        space = get_space(len(nodes[0]), len(nodes[0][0])) # Precomputes all possible cell swaps (transpositions) within the grid
         list_edges = set()
         for node in nodes:
             # Find all possible neighbors
-            node_list = [list(line) for line in node] # transforme to make mutable
-            for transposition in list_transpositions:
-                target = deepcopy(node_list) 
-                ((i_0, j_0), (i_1, j_1)) = transposition # Unpacks the row and column indices for swapping cells
-                target[i_0][j_0], target[i_1][j_1] = target[i_1][j_1], target[i_0][j_0] # makes the swap
-                target_tuple = tuple(tuple(line) for line in target)
+            state = space.encode(node)
+            for _, target in space.neighbors(state):
+                target_tuple = space.to_tuple(target)
                 list_edges.add((node, target_tuple)) #Adds the edge to the set
                 list_edges.add((target_tuple, node)) # adds the edge in the other way 
         return list(list_edges)
 
     """
-    We can create a complete graph from the grid
+    The swap graph does not need to be built: its edges are the precomputed adjacent transpositions, 
+    so the neighbors of a state are generated when BFS reaches it.
+    """
+    def swap_graph(self):
+        """
+        Returns the graph of the states of the grid as an ImplicitGraph whose nodes are compact states (see to_state).
+        """
+        space = get_space(self.m, self.n)
+        return ImplicitGraph(lambda state: [target for _, target in space.neighbors(state)], [self.to_state()])
+
+    """
     We will apply BFS to the grid, starting from 'self' (the current grid), and aiming for the solved grid
     We will find the best path between the current grid and the solved one
     """
     
-    def find_best_path(self):
-        if not hasattr(self, "path_graph"):
-            path_graph_nodes = self.grids_graph()
-            self.path_graph = Graph(path_graph_nodes)
-            self.path_graph.edges = self.all_edges()
-            # We do not completely fulfill the graph attributes because it is not useful
-        n = self.n
-        m = self.m
-        solved = tuple(tuple(range(n*i+1,n*(i+1)+1)) for i in range(m))
-        current = tuple(tuple(line) for line in self.state)
-        return self.path_graph.bfs(current, solved)
+    def find_best_path(self, bidirectional=False):
+        """
+        Finds a shortest path from the grid to the sorted grid. 
+        If bidirectional is True, the search is run from both ends (see search.bidirectional_bfs), 
+        which explores about the square root of the states explored by the BFS of swap_graph.
+        The grids of at most DistanceTable.max_size cells are solved by looking up their precomputed distance table.
+        """
+        space = get_space(self.m, self.n)
+        if space.size <= DistanceTable.max_size:
+            path = get_distance_table(self.m, self.n).path(self.to_state())
+        elif bidirectional:
+            path = bidirectional_bfs(space, self.to_state(), space.goal)
+        else:
+            path = self.swap_graph().bfs(self.to_state(), space.goal)
+        # Convert the compact states to the format of make_hashable
+        return tuple(space.to_tuple(state) for state in path)
     
 
     #create an object from a file (a grid is created with a file)
@@ -318,128 +424,206 @@ class Grid():
         grid: Grid
             The grid
         """
-        with open(file_name, "r") as file:
-            m, n = map(int, file.readline().split())
-            initial_state = [[] for i_line in range(m)]
-            for i_line in range(m):
-                line_state = list(map(int, file.readline().split()))
-                if len(line_state) != n: 
-                    raise Exception("Format incorrect")
-                initial_state[i_line] = line_state
-            grid = Grid(m, n, initial_state)
+        lines = read_lines(file_name)
+        grid, end = cls.read_grid(lines, 0)
+        if any(lines[end:]):
+            raise Exception("Format incorrect")
         return grid
 
+    @classmethod
+    def read_grid(cls, lines, start):
+        """
+        Creates a grid from the lines of integers of a file (see loader.read_lines): the line "m n" at index start, 
+        followed by m lines of n cells. Returns the grid and the index of the line following its last line.
+        """
+        if start >= len(lines) or len(lines[start]) != 2:
+            raise Exception("Format incorrect")
+        m, n = lines[start]
+        start += 1
+        if m <= 0 or n <= 0 or start + m > len(lines):
+            raise Exception("Format incorrect")
+        initial_state = lines[start:start + m]
+        for line_state in initial_state:
+            if len(line_state) != n: 
+                raise Exception("Format incorrect")
+        return cls(m, n, initial_state), start + m
+
+    @classmethod
+    def grids_from_file(cls, file_name):
+        """
+        Creates all the grids of a multi-grid file, which is read at once.
+        
+        Parameters: 
+        -----------
+        file_name: str
+            Name of the file to load. The file must be of the format: 
+            - first line contains the number k of grids
+            - then the k grids follow, each one in the format of grid_from_file
 
+        Output: 
+        -------
+        grids: list[Grid]
+            The k grids, in the order of the file
+        """
+        lines = read_lines(file_name)
+        if not lines or len(lines[0]) != 1:
+            raise Exception("Format incorrect")
+        grids = []
+        position = 1
+        for _ in range(lines[0][0]):
+            grid, position = cls.read_grid(lines, position)
+            grids.append(grid)
+        if any(lines[position:]):
+            raise Exception("Format incorrect")
+        return grids
 
-    def bfs_bis(self, dst):
-        # Initialize a graph with the current grid state as a node
-        dico = Graph([self.make_hashable()])
-        m, n = self.m, self.n
-        # Initialize a queue with tuples containing the current state and its path
-        file = deque([(self.make_hashable(), [self.make_hashable()])])
-        # Convert the destination grid to a hashable type
-        ndst = dst.make_hashable()
+    @staticmethod
+    def grids_to_file(grids, file_name):
+        """
+        Writes a list of grids in the multi-grid format read by grids_from_file.
+        """
+        lines = [f"{len(grids)}"]
+        for grid in grids:
+            lines.append(f"{grid.m} {grid.n}")
+            lines += [" ".join(map(str, line)) for line in grid.state]
+        with open(file_name, "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+
+    def bfs_bis(self, dst, bidirectional=False, workers=1, stats=None):
+        """
+        Finds a shortest path from the grid to the grid dst by BFS on the compact states.
+        If bidirectional is True, a BFS is also run from dst and the two searches meet in the middle (see search.bidirectional_bfs).
+        If workers > 1, the levels are expanded by this number of processes (see parallel.ShardedBFS). 
+        The bidirectional search is not parallel, so both options cannot be used together.
+        If stats (a stats.SearchStats) is given, it is filled with the statistics of the search.
+
+        Output: 
+        -------
+        path: list[tuple[tuple[int]]] | None
+            The list of the states (in the format of make_hashable) from self to dst. None if dst is not reachable.
+        """
+        if bidirectional and workers > 1:
+            raise Exception("the bidirectional search does not use several workers")
+        space = get_space(self.m, self.n)
+        src = self.to_state()
+        ndst = dst.to_state()
+        if bidirectional or workers > 1:
+            if bidirectional:
+                path = bidirectional_bfs(space, src, ndst, stats=stats)
+            else:
+                path = parallel_bfs(space, src, ndst, workers, stats)
+            return None if path is None else [space.to_tuple(state) for state in path]
+        if stats is not None:
+            stats.start("bfs_bis")
+            # the depth of each state, only needed for the statistics
+            depths = {src: 0}
+        # parents[s] is the state from which s was discovered
+        parents = {src: None}
+        file = deque([src])
+        path = None
 
         while file:
-            # Remove and return the leftmost path
-            s, path = file.popleft()
-            # Check if the current path's endpoint is the destination
+            s = file.popleft()
+            # Check if the current state is the destination
             if s == ndst:
-                return path
-            save = copy.deepcopy(self.state)
-            # Explore all possible moves from the current state
-            for i in range(m):
-                for j in range(n):
-                    self.state = copy.deepcopy(save)
-                    # Check all four directions where a swap can happen
-                    # Swapping with the cell below
-                    if i < m - 1:
-                        # Create a new grid state by swapping and convert it to hashable
-                        bas = self.swap_seq([((i, j), (i + 1, j))])
-                        h_bas = bas.make_hashable()
-                        # Add a new edge if this state is new
-                        if h_bas not in dico.graph[s]:
-                            dico.add_edge(s, h_bas)
-
-                    # Swapping with the cell to the right
-                    if j < n - 1:
-                        droite = self.swap_seq([((i, j), (i, j + 1))])
-                        h_droite = droite.make_hashable()
-                        if h_droite not in dico.graph[s]:
-                            dico.add_edge(s, h_droite)
-
-
-            # Add new states to explore to the queue
-            for i in dico.graph[s]:
-                if i not in path:
-                    file.append((i, path + [i]))
-                
-        return None
+                path = [space.to_tuple(state) for state in rebuild_path(parents, s)]
+                break
+            if stats is not None:
+                stats.expand(depths[s], len(file))
+            # Explore all possible swaps from the current state
+            for _, t in space.neighbors(s):
+                if t not in parents:
+                    parents[t] = s
+                    file.append(t)
+                    if stats is not None:
+                        depths[t] = depths[s] + 1
+
+        if stats is not None:
+            stats.generated = stats.expanded*len(space.swaps)
+            stats.duplicates = stats.generated - (len(parents) - 1)
+            stats.finish(len(parents), src, None if path is None else len(path) - 1)
+        return path
 
    
     def heuristique0(self):
-        misplaced_count = 0
-        for i in range(self.n):
-            for j in range(self.m):
-                if self.state[i][j] != j + self.n * i + 1:  
-                    misplaced_count += 1
-        # Return the total distance divided by 2 to ensure it is less than real distance
-        return misplaced_count/2
-
-    @staticmethod
-    def trouver_coordonnees(liste, element):
-        # Find the coordinates of an element in the grid
-        for i, sous_liste in enumerate(liste):
-            if element in sous_liste:
-                # Return the coordinates once the element is found.
-                return i, sous_liste.index(element)
-        # Return None if the element is not found
-        return None
-
+        # Count the misplaced tiles on the flat state (see heuristics.Misplaced)
+        # Return the count divided by 2 to ensure it is less than real distance
+        return sorted_heuristic("misplaced", self.m, self.n)(self.to_state())
 
 
     def heuristique1(self):
         # Calculate heuristic based on the Manhattan distance for each tile to its target location.
-        n, m, l = self.n, self.m, self.state
-        k=0
-        dist = 0
-        # Iterate to compute Manhattan distance for each tile.
-        for i in range(m):
-            for j in range(n):
-                k += 1
-                # Find the current position of k and calculate Manhattan distance.
-                x, y = self.trouver_coordonnees(l, k)
-                dist += abs(x - i) + abs(y - j)
+        # The distances come from a precomputed table of the goal positions (see heuristics.Manhattan), 
+        # so there is no need to search the grid for each tile.
         # Return the total distance divided by 2 to ensure it is less than real distance
-        return dist/2
+        return sorted_heuristic("manhattan", self.m, self.n)(self.to_state())
 
 
 
-    def bfs_ter(self, dst):
-        # Initialisation avec l'état actuel de la grille et un chemin vide.
-        file = [(self.heuristique1(), [], self)]
-        visited = set([self.make_hashable()])  
-        hash_dst = dst.make_hashable()
-        while file:
-            _, path, current_grid = heappop(file)
-            current_state = current_grid.make_hashable()
-
-            if current_state == hash_dst:
-                return path  # Retourne le chemin sous forme de swaps
-
-            for i in range(self.m):
-                for j in range(self.n):
-                    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        x, y = i + dx, j + dy
-                        if 0 <= x < self.m and 0 <= y < self.n:
-                            new_grid = copy.deepcopy(current_grid)
-                            if (abs(i - x) == 1 and j == y) or (abs(j - y) == 1 and i == x):
-                                new_grid.swap((i, j), (x, y))
-                                new_state = new_grid.make_hashable()
-
-                                if new_state not in visited:
-                                    visited.add(new_state)
-                                    new_path = path + [((i, j), (x, y))]
-                                    heappush(file, (new_grid.heuristique1() + len(new_path), new_path, new_grid))
-
-        return None  # Retourne None si aucun chemin n'est trouvé
\ No newline at end of file
+    def bfs_ter(self, dst, heuristic="manhattan", stats=None):
+        """
+        Finds a shortest sequence of swaps from the grid to the grid dst with A* (see search.astar).
+        The heuristic is "manhattan" (as heuristique1), "misplaced" (as heuristique0) or "pattern" (see heuristics.PatternDatabase), computed towards dst.
+        If stats (a stats.SearchStats) is given, it is filled with the statistics of the search.
+
+        Output: 
+        -------
+        path: list[tuple[tuple[int]]] | None
+            The swaps in the format [((i1, j1), (i2, j2)), ...]. None if dst is not reachable.
+        """
+        space = get_space(self.m, self.n)
+        goal = dst.to_state()
+        return astar(space, self.to_state(), goal, HEURISTICS[heuristic](space, goal), stats=stats)
+
+
+    def bounded_search(self, dst, bound=1.5, mode="weighted", heuristic="manhattan"):
+        """
+        Finds a sequence of swaps from the grid to the grid dst, at most bound times longer than the shortest one (given by bfs_ter).
+        It expands much fewer states than bfs_ter on large grids.
+
+        Parameters: 
+        -----------
+        dst: Grid
+            The grid to reach
+        bound: float
+            The suboptimality bound, at least 1.
+        mode: str
+            "weighted" for weighted A* with the weight bound (see search.weighted_astar), 
+            "focal" for focal search (see search.focal_search).
+        heuristic: str
+            A key of heuristics.HEURISTICS, computed towards dst.
+
+        Output: 
+        -------
+        path: list[tuple[tuple[int]]] | None
+            The swaps in the format [((i1, j1), (i2, j2)), ...]. None if dst is not reachable.
+        achieved_bound: float
+            len(path) is at most achieved_bound times the length of a shortest path (achieved_bound <= bound).
+        """
+        space = get_space(self.m, self.n)
+        goal = dst.to_state()
+        search = {"weighted": weighted_astar, "focal": focal_search}[mode]
+        return search(space, self.to_state(), goal, bound, HEURISTICS[heuristic](space, goal))
+
+    def ida_star(self, dst, heuristic="manhattan"):
+        """
+        Finds a shortest sequence of swaps from the grid to the grid dst with IDA* (see search.ida_star).
+        It uses a memory proportional to the length of the solution, so it can run on grids where A* runs out of memory.
+
+        Parameters: 
+        -----------
+        dst: Grid
+            The grid to reach
+        heuristic: str
+            "manhattan" (as heuristique1), "misplaced" (as heuristique0) or "pattern" (see heuristics.PatternDatabase), computed towards dst.
+
+        Output: 
+        -------
+        path: list[tuple[tuple[int]]] | None
+            The swaps in the format [((i1, j1), (i2, j2)), ...]. None if dst is not reachable.
+        """
+        space = get_space(self.m, self.n)
+        goal = dst.to_state()
+        return ida_star(space, self.to_state(), goal, HEURISTICS[heuristic](space, goal))
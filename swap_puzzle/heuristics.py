@@ -0,0 +1,311 @@
+"""
+This is the heuristics module. It contains the admissible heuristics used by the search algorithms of the search module.
+
+A heuristic is built for a state space and a goal state, and it is called on a state (bytes, tuple or list of cell values).
+Manhattan and Misplaced can also be updated after a swap: only the two swapped tiles change their contribution, so update is O(1).
+They can also evaluate many states at once with batch, on a NumPy array with one state per line.
+"""
+
+import json
+from functools import lru_cache
+from math import perm
+import numpy as np
+from ranking import rank_partial
+from state import get_space
+from table import load_or_build, map_file, write_atomic
+
+
+class Manhattan:
+    """
+    The sum over all the tiles of the Manhattan distance to their cell in the goal, divided by 2
+    (a swap moves two tiles by one cell, so it is admissible and consistent). Generalizes Grid.heuristique1.
+
+    Attributes:
+    -----------
+    table: list[list[int]]
+        table[k][value] is the distance between the cell k and the cell of value in the goal.
+    """
+
+    def __init__(self, space, goal):
+        """
+        Precomputes the distances to the goal position of every tile.
+
+        Parameters:
+        -----------
+        space: StateSpace
+            The state space of the grid
+        goal: bytes | tuple[int]
+            The state to reach
+        """
+        position = [0]*(space.size + 1)
+        for k, value in enumerate(goal):
+            position[value] = k
+        self.table = [[space.distance[k][position[value]] for value in range(space.size + 1)] for k in range(space.size)]
+        # goal_row[value] and goal_col[value] are the coordinates of the cell of value in the goal, row[k] and col[k] those of the cell k
+        self.goal_row = np.array(position) // space.n
+        self.goal_col = np.array(position) % space.n
+        self.row = np.arange(space.size) // space.n
+        self.col = np.arange(space.size) % space.n
+
+    def __call__(self, state):
+        """
+        Returns the value of the heuristic on state.
+        """
+        table = self.table
+        return sum(table[k][value] for k, value in enumerate(state))/2
+
+    def update(self, h, state, a, b):
+        """
+        Returns the value of the heuristic after swapping the cells a and b of state, h being its value on state (before the swap).
+        """
+        table, value_a, value_b = self.table, state[a], state[b]
+        return h + (table[a][value_b] + table[b][value_a] - table[a][value_a] - table[b][value_b])/2
+
+    def batch(self, states):
+        """
+        Returns the values of the heuristic on the lines of states, an array of shape (k, size), as an array of shape (k,).
+        """
+        return (np.abs(self.row - self.goal_row[states]) + np.abs(self.col - self.goal_col[states])).sum(axis=1)/2
+
+
+class Misplaced:
+    """
+    The number of tiles that are not in their cell of the goal, divided by 2
+    (a swap moves only two tiles, so it is admissible and consistent). Generalizes Grid.heuristique0.
+
+    Attributes:
+    -----------
+    goal: tuple[int]
+        The state to reach
+    """
+
+    def __init__(self, space, goal):
+        """
+        Parameters:
+        -----------
+        space: StateSpace
+            The state space of the grid
+        goal: bytes | tuple[int]
+            The state to reach
+        """
+        self.goal = tuple(goal)
+        self.goal_array = np.array(self.goal)
+
+    def __call__(self, state):
+        """
+        Returns the value of the heuristic on state.
+        """
+        return sum(1 for value, target in zip(state, self.goal) if value != target)/2
+
+    def update(self, h, state, a, b):
+        """
+        Returns the value of the heuristic after swapping the cells a and b of state, h being its value on state (before the swap).
+        """
+        goal, value_a, value_b = self.goal, state[a], state[b]
+        before = (value_a != goal[a]) + (value_b != goal[b])
+        after = (value_b != goal[a]) + (value_a != goal[b])
+        return h + (after - before)/2
+
+    def batch(self, states):
+        """
+        Returns the values of the heuristic on the lines of states, an array of shape (k, size), as an array of shape (k,).
+        """
+        return (states != self.goal_array).sum(axis=1)/2
+
+
+class PatternDatabase:
+    """
+    Disjoint pattern databases for the m x n swap puzzle, towards the sorted grid.
+
+    The tiles are split into disjoint patterns, and the cost of each swap is shared between the patterns of the two swapped tiles:
+    a swap of two tiles of the same pattern costs 1 to this pattern, a swap of tiles of two patterns costs 1/2 to each of them.
+    For each pattern, the table gives for every placement of its tiles the smallest cost needed to bring them to their cells, 
+    the other tiles being indistinguishable. It is computed by a shortest path search from the sorted placement 
+    (the swaps are reversible, so it is also the backward distance). 
+    The costs of a swap add up to 1 over the patterns, so the sum of the tables is admissible and consistent. 
+    It is never lower than the Manhattan heuristic, and higher when the tiles of a pattern get in the way of each other.
+
+    A placement (p_0, ..., p_{k-1}) of the tiles of a pattern is stored at its rank among the size!/(size-k)! placements
+    (see ranking.rank_partial), with the cost in half swaps in one byte, so the patterns are kept small enough for the tables to fit in memory.
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    patterns: list[list[int]]
+        The disjoint patterns, as lists of tiles.
+    tables: list[bytearray | memoryview]
+        tables[i] is the table of patterns[i].
+    """
+
+    # the default patterns have at most this number of placements
+    max_placements = 200000
+
+    def __init__(self, m, n, patterns, tables):
+        """
+        Initializes the database from its tables. Use PatternDatabase.build or PatternDatabase.load to get them.
+        """
+        self.m = m
+        self.n = n
+        self.patterns = [list(pattern) for pattern in patterns]
+        self.tables = tables
+
+    def __repr__(self):
+        """
+        Returns a representation of the database with its patterns.
+        """
+        return f"<heuristics.PatternDatabase: m={self.m}, n={self.n}, patterns={self.patterns}>"
+
+    @classmethod
+    def default_patterns(cls, m, n):
+        """
+        Splits the tiles 1..m*n in consecutive groups, as large as possible with at most max_placements placements each.
+        """
+        size = m*n
+        k, placements = 1, size
+        while k < size and placements*(size - k) <= cls.max_placements:
+            placements *= size - k
+            k += 1
+        return [list(range(first, min(first + k, size + 1))) for first in range(1, size + 1, k)]
+
+    @classmethod
+    def build(cls, m, n, patterns=None):
+        """
+        Computes the tables of the patterns (default_patterns if None) by BFS.
+        """
+        if patterns is None:
+            patterns = cls.default_patterns(m, n)
+        space = get_space(m, n)
+        return cls(m, n, patterns, [cls.build_table(space, pattern) for pattern in patterns])
+
+    @staticmethod
+    def build_table(space, pattern):
+        """
+        Computes the table of one pattern (in half swaps) by a shortest path search from the placement of its tiles in the sorted grid.
+        The costs are 1 or 2 half swaps, so a list of buckets indexed by the cost is used as the priority queue.
+        """
+        size = space.size
+        table = bytearray([255])*perm(size, len(pattern))
+        start = tuple(tile - 1 for tile in pattern)
+        table[rank_partial(start, size)] = 0
+        buckets = [[start]]
+        cost = 0
+        while cost < len(buckets):
+            for positions in buckets[cost]:
+                if table[rank_partial(positions, size)] < cost:
+                    # already reached with a lower cost
+                    continue
+                # tile_at[cell] is the index in the pattern of the tile in cell
+                tile_at = {p: i for i, p in enumerate(positions)}
+                for a, b in space.swaps:
+                    i_a, i_b = tile_at.get(a), tile_at.get(b)
+                    if i_a is None and i_b is None:
+                        continue
+                    new_positions = list(positions)
+                    new_cost = cost + 1
+                    if i_a is not None:
+                        new_positions[i_a] = b
+                    if i_b is not None:
+                        new_positions[i_b] = a
+                        new_cost += i_a is not None
+                    index = rank_partial(new_positions, size)
+                    if new_cost < table[index]:
+                        table[index] = new_cost
+                        while len(buckets) <= new_cost:
+                            buckets.append([])
+                        buckets[new_cost].append(tuple(new_positions))
+            buckets[cost] = None
+            cost += 1
+        return table
+
+    def save(self, file_name):
+        """
+        Writes the database to a file (see table.write_atomic): a line with the header in json, followed by the raw tables.
+        """
+        header = {"m": self.m, "n": self.n, "patterns": self.patterns}
+        write_atomic(file_name, [json.dumps(header).encode() + b"\n"] + list(self.tables))
+
+    @classmethod
+    def load(cls, file_name, m=None, n=None):
+        """
+        Loads a database written by save (see table.map_file). The file is memory-mapped, so the tables are not read in memory at once.
+        """
+        data, header, offset = map_file(file_name, m, n)
+        size = header["m"]*header["n"]
+        tables = []
+        view = memoryview(data)
+        for pattern in header["patterns"]:
+            length = perm(size, len(pattern))
+            tables.append(view[offset:offset + length])
+            offset += length
+        if offset != len(data):
+            raise Exception("Format incorrect")
+        return cls(header["m"], header["n"], header["patterns"], tables)
+
+    def heuristic(self, goal=None):
+        """
+        Returns the heuristic of the database towards goal (default is the sorted grid). See PatternHeuristic.
+        """
+        space = get_space(self.m, self.n)
+        return PatternHeuristic(self, space, space.goal if goal is None else goal)
+
+
+class PatternHeuristic:
+    """
+    The heuristic given by a PatternDatabase: the sum of the values of the patterns (the tables are in half swaps, hence divided by 2).
+    The database is computed towards the sorted grid: for another goal, the tiles are renamed 
+    by their position in the goal before the lookup.
+    """
+
+    def __init__(self, database, space, goal):
+        """
+        Parameters:
+        -----------
+        database: PatternDatabase
+            The tables of the patterns
+        space: StateSpace
+            The state space of the grid
+        goal: bytes | tuple[int]
+            The state to reach
+        """
+        self.database = database
+        self.size = space.size
+        # rename[value] is the tile that value stands for in the database
+        self.rename = [0]*(space.size + 1)
+        for k, value in enumerate(goal):
+            self.rename[value] = k + 1
+
+    def __call__(self, state):
+        """
+        Returns the value of the heuristic on state.
+        """
+        position = [0]*(self.size + 1)
+        rename = self.rename
+        for k, value in enumerate(state):
+            position[rename[value]] = k
+        return sum(table[rank_partial([position[tile] for tile in pattern], self.size)] 
+                   for pattern, table in zip(self.database.patterns, self.database.tables))/2
+
+
+@lru_cache(maxsize=None)
+def get_pattern_database(m, n):
+    """
+    Returns the (shared) PatternDatabase of the m x n grids with the default patterns. It is loaded from table.TABLE_DIRECTORY
+    if it was already computed, otherwise it is built and saved there (see table.load_or_build).
+    """
+    return load_or_build(PatternDatabase, m, n, "patterns")
+
+
+HEURISTICS = {"misplaced": Misplaced, "manhattan": Manhattan, 
+              "pattern": lambda space, goal: get_pattern_database(space.m, space.n).heuristic(goal)}
+
+
+@lru_cache(maxsize=None)
+def sorted_heuristic(name, m, n):
+    """
+    Returns the (shared) heuristic called name towards the sorted m x n grid.
+    """
+    space = get_space(m, n)
+    return HEURISTICS[name](space, space.goal)
@@ -1,6 +1,7 @@
 
 from grid import Grid
 from graph import Graph
+from cache import SolutionCache
 import pygame
 import random
 import sys
@@ -10,6 +11,9 @@ WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 
+# Les solutions déjà calculées, pour ne pas relancer bfs_ter sur une grille déjà jouée.
+solution_cache = SolutionCache()
+
 def create_random_grid(size):
     numbers = random.sample(range(1, size*size+1), size*size)
     grid = [numbers[i:i + size] for i in range(0, size*size, size)]
@@ -22,13 +26,9 @@ class Game:
         self.selected_row = -1
         self.selected_col = -1
         self.moves = 0
-        # On doit passer ici une grille résolue pour calculer le chemin optimal.
-        
-        solved_state = [list(range(i * grid.n + 1, (i + 1) * grid.n )) for i in range(grid.m)]
-        solved_grid = Grid(grid.m, grid.n, solved_state)
-
-        # Calculer le nombre maximal de mouvements que l'utilisateur aura le droitt de faire via bfs_ter.
-        path = grid.bfs_ter(solved_grid)
+        # Calculer le nombre maximal de mouvements que l'utilisateur aura le droitt de faire via bfs_ter
+        # (vers la grille résolue), en réutilisant la solution si la grille a déjà été résolue.
+        path = solution_cache.solve(grid, "bfs_ter")
         if path is not None:
             self.max_moves = len(path)
         else:
@@ -0,0 +1,25 @@
+"""
+This is the loader module. It reads the input files in one pass instead of line by line.
+"""
+
+
+def read_lines(file_name):
+    """
+    Reads all the integers of a text file at once, keeping the line structure, to check the number of values on each line.
+
+    Parameters: 
+    -----------
+    file_name: str
+        Name of the file to read
+
+    Output: 
+    -------
+    lines: list[list[int]]
+        The integers of each line of the file, in order.
+    """
+    with open(file_name, "rb") as file:
+        data = file.read()
+    try:
+        return [list(map(int, line.split())) for line in data.splitlines()]
+    except ValueError:
+        raise Exception("Format incorrect")
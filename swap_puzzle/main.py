@@ -110,15 +110,6 @@ nouvelle_grille1 = Grid(len(grille_init1),len(grille_init1[0]), grille_init1)
 count = nouvelle_grille1.heuristique0()
 print(count)
 
-#test trouver_coordonnees
-print("test trouver_coordonnees")
-grille_init1 = [[1,3],[4,2]]
-nouvelle_grille1 = Grid(len(grille_init1),len(grille_init1[0]), grille_init1)
-
-coordonnees = Grid.trouver_coordonnees(nouvelle_grille1.state, 3)
-print(coordonnees)
-
-
 # test heuristique1
 print("test heuristique1")
 grille_init1 = [[1, 3], [4, 2]]  
@@ -0,0 +1,147 @@
+"""
+This is the moves module. It validates and applies whole sequences of swaps with NumPy, to replay and check many solutions quickly.
+
+The k sequences of swaps [((i1, j1), (i2, j2)), ...] are padded to the same length L and put in one array of shape (k, L, 2, 2)
+(see pad_sequences).
+"""
+
+from itertools import chain
+import numpy as np
+
+
+def first_illegal_move(m, n, moves):
+    """
+    Checks a sequence of swaps with one vectorized test: both cells must be in the grid and next to each other.
+
+    Parameters:
+    -----------
+    m, n: int
+        The size of the grid
+    moves: list[tuple[tuple[int]]] | np.ndarray
+        The swaps in the format [((i1, j1), (i2, j2)), ...], or an array of shape (L, 2, 2).
+
+    Output:
+    -------
+    index: int | None
+        The index of the first illegal swap, None if all the swaps are legal.
+    """
+    cells = np.asarray(moves, dtype=np.int64).reshape(-1, 2, 2)
+    rows, cols = cells[:, :, 0], cells[:, :, 1]
+    inside = ((rows >= 0) & (rows < m) & (cols >= 0) & (cols < n)).all(axis=1)
+    adjacent = np.abs(rows[:, 0] - rows[:, 1]) + np.abs(cols[:, 0] - cols[:, 1]) == 1
+    illegal = np.flatnonzero(~(inside & adjacent))
+    return int(illegal[0]) if len(illegal) else None
+
+
+def is_sorted_batch(states):
+    """
+    Checks if many states are sorted with one comparison to the sorted state 1..size.
+
+    Parameters:
+    -----------
+    states: np.ndarray | list
+        Array of shape (k, size), one flat state per line, or of shape (k, m, n).
+
+    Output:
+    -------
+    sorted: np.ndarray
+        Array of k booleans.
+    """
+    states = np.asarray(states)
+    states = states.reshape(len(states), -1)
+    return (states == np.arange(1, states.shape[1] + 1)).all(axis=1)
+
+
+def pad_sequences(sequences):
+    """
+    Puts k sequences of swaps in one array of shape (k, L, 2, 2), L being the length of the longest one.
+    The shorter sequences are padded with swaps of the cell (0, 0) with itself, which change nothing.
+
+    Output:
+    -------
+    cells: np.ndarray
+        The padded swaps.
+    lengths: np.ndarray
+        The lengths of the sequences.
+    """
+    lengths = np.array([len(moves) for moves in sequences], dtype=np.int64)
+    cells = np.zeros((len(sequences), lengths.max(initial=0), 2, 2), dtype=np.int64)
+    # all the coordinates are read at once, then written in the slots of the swaps in the order of the lines
+    values = np.fromiter(chain.from_iterable(chain.from_iterable(chain.from_iterable(sequences))),
+                         dtype=np.int64, count=4*int(lengths.sum()))
+    cells[np.arange(cells.shape[1]) < lengths[:, None]] = values.reshape(-1, 2, 2)
+    return cells, lengths
+
+
+def apply_batch(states, sequences, n):
+    """
+    Applies a sequence of swaps to each of many states of the same shape. The sequences are padded to the same length
+    (see pad_sequences), then the t-th swaps of all the sequences are applied together.
+
+    Parameters:
+    -----------
+    states: np.ndarray
+        Array of shape (k, size), one flat state per line. It is not modified.
+    sequences: list[list[tuple[tuple[int]]]] | np.ndarray
+        The k sequences of swaps, in the format of Grid.swap_seq, or already padded. They must be legal (see first_illegal_move).
+    n: int
+        Number of columns in the grid
+
+    Output:
+    -------
+    states: np.ndarray
+        The states after the swaps.
+    """
+    states = np.array(states)
+    cells = sequences if isinstance(sequences, np.ndarray) else pad_sequences(sequences)[0]
+    size = states.shape[1]
+    # indices of the swapped cells in the flattened array of all the states
+    pairs = cells[:, :, :, 0]*n + cells[:, :, :, 1] + (np.arange(len(states))*size)[:, None, None]
+    flat = states.reshape(-1)
+    for t in range(pairs.shape[1]):
+        a, b = pairs[:, t, 0], pairs[:, t, 1]
+        flat[a], flat[b] = flat[b], flat[a]
+    return states
+
+
+def verify_solutions(m, n, states, sequences):
+    """
+    Checks that each sequence of swaps is legal and sorts its state (see verify_padded).
+
+    Parameters:
+    -----------
+    m, n: int
+        The size of the grids
+    states: np.ndarray | list
+        The k flat states, one per line.
+    sequences: list[list[tuple[tuple[int]]]]
+        The k sequences of swaps, in the format of Grid.swap_seq.
+
+    Output:
+    -------
+    solved: np.ndarray
+        Array of k booleans, True when the sequence is legal and sorts the state.
+    illegal: np.ndarray
+        Array of k integers, the index of the first illegal swap of each sequence (-1 if all are legal).
+    """
+    return verify_padded(m, n, states, *pad_sequences(sequences))
+
+
+def verify_padded(m, n, states, cells, lengths):
+    """
+    Does the same as verify_solutions on sequences already padded by pad_sequences. All the swaps are validated 
+    with one vectorized test, then the legal sequences are applied together (see apply_batch).
+    """
+    states = np.asarray(states)
+    rows, cols = cells[..., 0], cells[..., 1]
+    inside = ((rows >= 0) & (rows < m) & (cols >= 0) & (cols < n)).all(axis=2)
+    adjacent = np.abs(rows[..., 0] - rows[..., 1]) + np.abs(cols[..., 0] - cols[..., 1]) == 1
+    padding = np.arange(cells.shape[1]) >= lengths[:, None]
+    wrong = ~(inside & adjacent | padding)
+    illegal = np.where(wrong.any(axis=1), wrong.argmax(axis=1), -1)
+    legal = illegal == -1
+    solved = np.zeros(len(cells), dtype=bool)
+    if legal.any():
+        results = apply_batch(states[legal], cells[legal], n)
+        solved[legal] = is_sorted_batch(results)
+    return solved, illegal
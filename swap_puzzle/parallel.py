@@ -0,0 +1,192 @@
+"""
+This is the parallel module. It contains a level-synchronous BFS whose visited set is shared out between worker processes.
+"""
+
+import os
+from multiprocessing import Pipe, Process
+from zlib import crc32
+from state import get_space
+
+
+def owner(state, workers):
+    """
+    Returns the index of the worker that owns state. It must not depend on the process, so hash() cannot be used.
+    """
+    return crc32(state) % workers
+
+
+def worker_loop(connection, m, n, workers, goal):
+    """
+    The loop of a worker process. The worker keeps the parents of the states it owns, and answers the messages:
+    - ("receive", blob): blob contains pairs (state, parent) sent by the workers at the previous level.
+      The states not yet reached become the new frontier of the worker.
+      It answers (number of new states, goal reached?).
+    - ("expand",): expands the frontier. It answers the list of blobs of pairs (child, state), one per owner.
+      It is only sent when no worker reached the goal, so the level of the goal is never expanded.
+    - ("parent", state): answers the parent of state.
+    - ("stop",): ends the loop.
+    """
+    space = get_space(m, n)
+    size = space.size
+    parents = {}
+    frontier = []
+    while True:
+        message = connection.recv()
+        if message[0] == "stop":
+            break
+        if message[0] == "parent":
+            connection.send(parents[message[1]])
+            continue
+        if message[0] == "receive":
+            blob = message[1]
+            frontier = []
+            for i in range(0, len(blob), 2*size):
+                state = blob[i:i + size]
+                if state not in parents:
+                    parents[state] = blob[i + size:i + 2*size]
+                    frontier.append(state)
+            connection.send((len(frontier), goal in parents))
+            continue
+        outgoing = [bytearray() for _ in range(workers)]
+        for state in frontier:
+            parent = parents[state]
+            for _, child in space.neighbors(state):
+                if child != parent:
+                    outgoing[owner(child, workers)] += child + state
+        connection.send([bytes(out) for out in outgoing])
+    connection.close()
+
+
+class ShardedBFS:
+    """
+    A BFS run level by level by several processes. Each state belongs to the worker owner(state, workers), which keeps
+    it in its part of the visited set. At each level, every worker deduplicates the states it received, expands the new ones
+    and sends each child to its owner. The workers first report the states they received, so the expansion stops 
+    as soon as the level of the goal is reached. The states are sent as concatenated bytes, so only the bytes-encoded state spaces
+    (at most 255 cells) are supported.
+
+    Attributes:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    workers: int
+        The number of processes
+    layer_sizes: list[int]
+        The number of states at each distance from start, filled level by level.
+    """
+
+    def __init__(self, space, workers=None):
+        """
+        Parameters:
+        -----------
+        space: StateSpace
+            The state space of the grid
+        workers: int, optional
+            The number of processes. Default is the number of processors.
+        """
+        if space.size > 255:
+            raise Exception("the grid is too large for a parallel BFS")
+        self.space = space
+        self.workers = workers or os.cpu_count() or 1
+        self.layer_sizes = []
+
+    def run(self, start, goal=None, stats=None):
+        """
+        Runs the BFS from start until goal is reached, or until all the reachable states are visited if goal is None.
+        If stats (a stats.SearchStats) is given, it is filled with the statistics of the search, counted level by level.
+
+        Output:
+        -------
+        path: list[bytes] | None
+            The states of a shortest path from start to goal. None if goal is None or not reachable.
+        """
+        space, workers = self.space, self.workers
+        if stats is not None:
+            stats.start("parallel_bfs")
+        connections, processes = [], []
+        for _ in range(workers):
+            connection, child_connection = Pipe()
+            process = Process(target=worker_loop, args=(child_connection, space.m, space.n, workers, goal), daemon=True)
+            process.start()
+            connections.append(connection)
+            processes.append(process)
+        try:
+            # The start state is its own parent
+            inboxes = [b""]*workers
+            inboxes[owner(start, workers)] = start + start
+            self.layer_sizes = []
+            path = None
+            while True:
+                for connection, inbox in zip(connections, inboxes):
+                    connection.send(("receive", inbox))
+                replies = [connection.recv() for connection in connections]
+                new_states = sum(reply[0] for reply in replies)
+                if new_states == 0:
+                    break
+                self.layer_sizes.append(new_states)
+                if any(reply[1] for reply in replies):
+                    path = self.rebuild_path(connections, start, goal)
+                    break
+                for connection in connections:
+                    connection.send(("expand",))
+                replies = [connection.recv() for connection in connections]
+                inboxes = [b"".join(reply[shard] for reply in replies) for shard in range(workers)]
+                if stats is not None:
+                    # the whole level was waiting, and each pair (child, state) sent is a generated child
+                    stats.expand(len(self.layer_sizes) - 1, new_states, new_states)
+                    stats.generated += sum(len(inbox) for inbox in inboxes)//(2*space.size)
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(("stop",))
+                except (BrokenPipeError, EOFError):
+                    # the worker already died, its error is the one raised
+                    pass
+            for process in processes:
+                process.join()
+        if stats is not None:
+            visited = sum(self.layer_sizes)
+            stats.duplicates = stats.generated - (visited - 1)
+            stats.finish(visited, start, None if path is None else len(path) - 1)
+        return path
+
+    def rebuild_path(self, connections, start, goal):
+        """
+        Rebuilds the path from start to goal by asking each state's owner for its parent.
+        """
+        path = [goal]
+        state = goal
+        while state != start:
+            connection = connections[owner(state, self.workers)]
+            connection.send(("parent", state))
+            state = connection.recv()
+            path.append(state)
+        path.reverse()
+        return path
+
+
+def parallel_bfs(space, start, goal, workers=None, stats=None):
+    """
+    Finds a shortest path from start to goal with a BFS shared out between worker processes (see ShardedBFS).
+    If stats (a stats.SearchStats) is given, it is filled with the statistics of the search.
+
+    Output:
+    -------
+    path: list[bytes] | None
+        The states from start to goal. None if goal is not reachable.
+    """
+    return ShardedBFS(space, workers).run(start, goal, stats)
+
+
+def parallel_layer_sizes(space, start, workers=None):
+    """
+    Explores all the states reachable from start with a BFS shared out between worker processes (see ShardedBFS).
+
+    Output:
+    -------
+    layer_sizes: list[int]
+        layer_sizes[d] is the number of states at distance d from start.
+    """
+    search = ShardedBFS(space, workers)
+    search.run(start)
+    return search.layer_sizes
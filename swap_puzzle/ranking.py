@@ -0,0 +1,95 @@
+"""
+This is the ranking module. It numbers the states of a grid from 0 to (m*n)! - 1, so they can index flat arrays
+(distance tables, visited sets) instead of being stored in sets of tuples.
+
+The rank of a state is its position among the permutations of 1..m*n in the lexicographic order, computed from its Lehmer code:
+the i-th digit is the number of values smaller than state[i] in state[i+1:], in base (size - i).
+The batch variants do the same on a NumPy array with one state per line.
+"""
+
+from math import factorial
+import numpy as np
+
+
+def rank(state):
+    """
+    Returns the rank of a state (a sequence of the values 1..size: bytes, tuple, list or flattened grid).
+    """
+    size = len(state)
+    result = 0
+    for i, value in enumerate(state):
+        smaller = 0
+        for other in state[i+1:]:
+            if other < value:
+                smaller += 1
+        result = result*(size - i) + smaller
+    return result
+
+
+def rank_partial(positions, size):
+    """
+    Returns the rank of a placement of k distinct values of range(size) (the cells of k tiles) among the size!/(size-k)! placements,
+    in the lexicographic order: the i-th digit is the number of values smaller than positions[i] not in positions[:i], in base (size - i).
+    For k = size, it is the rank of the state whose cell values are positions[i] + 1.
+    """
+    result = 0
+    # the bit p of used is set once the value p is placed
+    used = 0
+    for i, p in enumerate(positions):
+        result = result*(size - i) + p - (used & ((1 << p) - 1)).bit_count()
+        used |= 1 << p
+    return result
+
+
+def unrank(index, size):
+    """
+    Returns the state (as a list) of the given rank among the permutations of 1..size. Inverse of rank.
+    """
+    values = list(range(1, size + 1))
+    state = []
+    for i in range(size - 1, -1, -1):
+        digit, index = divmod(index, factorial(i))
+        state.append(values.pop(digit))
+    return state
+
+
+def rank_batch(states):
+    """
+    Returns the ranks of many states.
+
+    Parameters:
+    -----------
+    states: np.ndarray
+        Array of shape (k, size), one state per line. size is at most 20, so that the ranks fit in 64 bits.
+
+    Output:
+    -------
+    ranks: np.ndarray
+        Array of shape (k,) of np.int64.
+    """
+    states = np.asarray(states)
+    size = states.shape[1]
+    ranks = np.zeros(len(states), dtype=np.int64)
+    for i in range(size):
+        smaller = (states[:, i+1:] < states[:, i:i+1]).sum(axis=1)
+        ranks = ranks*(size - i) + smaller
+    return ranks
+
+
+def unrank_batch(ranks, size):
+    """
+    Returns the states of many ranks, as an array of shape (k, size) of np.uint8 (np.int64 if size > 255). Inverse of rank_batch.
+    """
+    ranks = np.asarray(ranks, dtype=np.int64).copy()
+    count = len(ranks)
+    states = np.empty((count, size), dtype=np.uint8 if size <= 255 else np.int64)
+    # unused[r, v] is True while the value v + 1 is not placed in the state r
+    unused = np.ones((count, size), dtype=bool)
+    lines = np.arange(count)
+    for i in range(size - 1, -1, -1):
+        digits, ranks = np.divmod(ranks, factorial(i))
+        # the value placed is the (digit + 1)-th unused one
+        values = np.argmax(np.cumsum(unused, axis=1) > digits[:, None], axis=1)
+        states[:, size - 1 - i] = values + 1
+        unused[lines, values] = False
+    return states
@@ -0,0 +1,627 @@
+"""
+This is the search module. It contains the search algorithms working on the compact states of state.StateSpace.
+"""
+
+import time
+import numpy as np
+from heapq import heappop, heappush
+from itertools import count
+from math import inf
+from state import rebuild_path
+from heuristics import Manhattan
+from visited import StateSet
+from analysis import lower_bound, parity_bound, permutation_parity
+from stats import TimedHeuristic
+
+
+class BudgetExhausted(Exception):
+    """
+    Raised by a search when its Budget is exhausted.
+    """
+
+
+class Budget:
+    """
+    A limit on the time and on the number of expanded states, shared by one or several searches.
+
+    Attributes:
+    -----------
+    deadline: float | None
+        The time.perf_counter() value after which the searches stop. None for no limit.
+    node_limit: int | None
+        The number of states that can be expanded. None for no limit.
+    nodes: int
+        The number of states expanded so far.
+    """
+
+    def __init__(self, time_limit=None, node_limit=None):
+        """
+        Parameters:
+        -----------
+        time_limit: float, optional
+            The time limit in seconds, counted from now. Default is no limit.
+        node_limit: int, optional
+            The maximal number of expanded states. Default is no limit.
+        """
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.node_limit = node_limit
+        self.nodes = 0
+
+    def spend(self):
+        """
+        Counts one expanded state. Raises BudgetExhausted if the budget is exceeded.
+        """
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise BudgetExhausted("node limit reached")
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExhausted("time limit reached")
+
+
+def rebuild_moves(space, parents, state):
+    """
+    Rebuilds the list of swaps leading to state.
+
+    Parameters:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    parents: dict
+        Maps every reached state to a pair (parent state, index of the swap), or None for the start state.
+    state: bytes | tuple[int]
+        The last state.
+
+    Output:
+    -------
+    moves: list[tuple[tuple[int]]]
+        The swaps in the format [((i1, j1), (i2, j2)), ...].
+    """
+    moves = []
+    while parents[state] is not None:
+        state, k = parents[state]
+        moves.append(space.moves[k])
+    moves.reverse()
+    return moves
+
+
+def bidirectional_bfs(space, start, goal, budget=None, stats=None):
+    """
+    Finds a shortest path from start to goal with two BFS, one from each end, which meet in the middle.
+    The swap graph is undirected, so the backward search uses the same neighbors. 
+    The smallest frontier is expanded one whole level at a time, and the search stops at the first level where
+    the two searches meet, keeping the shortest of the paths found in this level.
+
+    Parameters:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    start: bytes | tuple[int]
+        The initial state
+    goal: bytes | tuple[int]
+        The state to reach
+    budget: Budget, optional
+        Limits the search. BudgetExhausted is raised when it is exceeded.
+    stats: SearchStats, optional
+        Filled with the statistics of the search (see the stats module). The depth of a state is counted from its own end.
+
+    Output:
+    -------
+    path: list[bytes | tuple[int]] | None
+        The states from start to goal. None if goal is not reachable.
+    """
+    if stats is not None:
+        stats.start("bidirectional_bfs")
+    path = [start] if start == goal else None
+    # For each side: the parent and the depth of every reached state, and the last level
+    parents = ({start: None}, {goal: None})
+    depths = ({start: 0}, {goal: 0})
+    frontiers = ([start], [goal])
+
+    while path is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own_parents, own_depths = parents[side], depths[side]
+        other_depths = depths[1 - side]
+        best, meeting = None, None
+        new_frontier = []
+        for state in frontiers[side]:
+            if budget is not None:
+                budget.spend()
+            if stats is not None:
+                stats.expand(own_depths[state], len(frontiers[0]) + len(frontiers[1]) + len(new_frontier))
+            depth = own_depths[state] + 1
+            for _, child in space.neighbors(state):
+                if child in own_parents:
+                    continue
+                own_parents[child] = state
+                own_depths[child] = depth
+                new_frontier.append(child)
+                if child in other_depths and (best is None or depth + other_depths[child] < best):
+                    best, meeting = depth + other_depths[child], child
+        frontiers = (new_frontier, frontiers[1]) if side == 0 else (frontiers[0], new_frontier)
+        if meeting is not None:
+            path = rebuild_path(parents[0], meeting)
+            # The backward half goes from meeting to goal
+            state = parents[1][meeting]
+            while state is not None:
+                path.append(state)
+                state = parents[1][state]
+    if stats is not None:
+        visited = len(parents[0]) + len(parents[1])
+        stats.generated = stats.expanded*len(space.swaps)
+        stats.duplicates = stats.generated - (visited - 2)
+        stats.finish(visited, start, None if path is None else len(path) - 1)
+    return path
+
+
+def bfs_layers(space, start, visited=None, budget=None):
+    """
+    Explores all the states reachable from start level by level, keeping only the current level in memory besides the visited set.
+
+    Parameters:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    start: bytes | tuple[int]
+        The initial state
+    visited: set-like, optional
+        The set of the reached states (with add and in). Default is a visited.StateSet (one bit per state)
+        for the grids of at most StateSet.max_memory_size cells, else a set.
+    budget: Budget, optional
+        Limits the search. BudgetExhausted is raised when it is exceeded.
+
+    Output:
+    -------
+    layer_sizes: list[int]
+        layer_sizes[d] is the number of states at distance d from start.
+    """
+    if visited is None:
+        visited = StateSet(space) if space.size <= StateSet.max_memory_size else set()
+    visited.add(start)
+    frontier = [start]
+    layer_sizes = []
+    while frontier:
+        layer_sizes.append(len(frontier))
+        new_frontier = []
+        for state in frontier:
+            if budget is not None:
+                budget.spend()
+            for _, child in space.neighbors(state):
+                if child not in visited:
+                    visited.add(child)
+                    new_frontier.append(child)
+        frontier = new_frontier
+    return layer_sizes
+
+
+def astar(space, start, goal, heuristic=None, weight=1, upper_bound=inf, budget=None, closed=None, stats=None):
+    """
+    Finds a shortest sequence of swaps from start to goal with the A* algorithm.
+    With a weight w > 1, the states are ordered by g + w*h and the solution is at most w times longer than a shortest one.
+
+    The heap contains (f, -g, counter, state): ties on f are broken in favour of the deepest states,
+    then by order of insertion, so states are never compared. Each state keeps its best known distance
+    g and its parent, and it is expanded at most once.
+    Every swap changes the parity of the permutation, so the number of swaps left from a state at depth g has a known parity:
+    h is rounded up to it (see analysis.parity_bound).
+
+    Parameters:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    start: bytes | tuple[int]
+        The initial state
+    goal: bytes | tuple[int]
+        The state to reach
+    heuristic: function, optional
+        An admissible and consistent heuristic towards goal. Default is Manhattan(space, goal).
+        If it has an update method (see the heuristics module), the children are evaluated incrementally.
+    weight: float, optional
+        The weight w of the heuristic. Default is 1 (optimal search).
+    upper_bound: int, optional
+        Only the solutions with less than upper_bound swaps are searched: the states with g + h >= upper_bound are pruned.
+    budget: Budget, optional
+        Limits the search. BudgetExhausted is raised when it is exceeded.
+    closed: set-like, optional
+        The set of the expanded states (with add and in), e.g. a visited.StateSet. Default is a set.
+    stats: SearchStats, optional
+        Filled with the statistics of the search (see the stats module).
+
+    Output:
+    -------
+    moves: list[tuple[tuple[int]]] | None
+        The swaps in the format [((i1, j1), (i2, j2)), ...]. None if goal is not reachable (in less than upper_bound swaps).
+    """
+    if heuristic is None:
+        heuristic = Manhattan(space, goal)
+    if stats is not None:
+        stats.start("astar" if weight == 1 else "weighted_astar")
+        heuristic = TimedHeuristic(heuristic, stats)
+    update = getattr(heuristic, "update", None)
+    swaps = space.swaps
+    counter = count()
+    g_score = {start: 0}
+    parents = {start: None}
+    if closed is None:
+        closed = set()
+    moves = None
+    heap = []
+    if sorted(start) == sorted(goal):
+        # the parity of the number of swaps left at depth g is (parity + g) % 2
+        parity = permutation_parity(start, goal)
+        h_start = heuristic(start)
+        if parity_bound(h_start, parity) < upper_bound:
+            # The heap contains (g + w*h, -g, counter, h, state), h before the rounding to the parity
+            heap = [(weight*parity_bound(h_start, parity), 0, next(counter), h_start, start)]
+
+    while heap:
+        _, minus_g, _, h, state = heappop(heap)
+        if state in closed:
+            # An outdated entry: the state was already expanded with a better g
+            continue
+        if state == goal:
+            moves = rebuild_moves(space, parents, state)
+            break
+        if budget is not None:
+            budget.spend()
+        if stats is not None:
+            stats.expand(-minus_g, len(heap))
+        closed.add(state)
+        g = 1 - minus_g
+        for k, child in space.neighbors(state):
+            if child in closed or g >= g_score.get(child, g + 1):
+                continue
+            # h of the child, updated from the h of the state
+            h_child = update(h, state, *swaps[k]) if update else heuristic(child)
+            bound = parity_bound(h_child, (parity + g) % 2)
+            if g + bound >= upper_bound:
+                continue
+            g_score[child] = g
+            parents[child] = (state, k)
+            heappush(heap, (g + weight*bound, -g, next(counter), h_child, child))
+    if stats is not None:
+        # every expansion generates all the swaps, and the children that were not pushed are the duplicates
+        stats.generated = stats.expanded*len(swaps)
+        stats.duplicates = stats.generated - max(next(counter) - 1, 0)
+        stats.finish(len(g_score), start, None if moves is None else len(moves))
+    return moves
+
+
+def batch_astar(space, start, goal, heuristic=None, batch_size=64, budget=None, stats=None):
+    """
+    Finds a shortest sequence of swaps from start to goal with A*, expanding the states by batches:
+    the batch_size states with the smallest f are popped together, all their children are built in one NumPy array
+    and the heuristic is evaluated on them with one vectorized call (its batch method).
+
+    A state of a batch can be expanded before its best g is known, so a state reached again with a smaller g is reopened,
+    and goal is only returned when it is the first state of a batch (it then has the smallest f), so the solution is a shortest one.
+    Only the states encoded as bytes (at most 255 cells) are supported.
+
+    Parameters:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    start: bytes
+        The initial state
+    goal: bytes
+        The state to reach
+    heuristic: function, optional
+        An admissible and consistent heuristic towards goal with a batch method. Default is Manhattan(space, goal).
+    batch_size: int, optional
+        The number of states expanded together.
+    budget: Budget, optional
+        Limits the search. BudgetExhausted is raised when it is exceeded.
+    stats: SearchStats, optional
+        Filled with the statistics of the search (see the stats module).
+
+    Output:
+    -------
+    moves: list[tuple[tuple[int]]] | None
+        The swaps in the format [((i1, j1), (i2, j2)), ...]. None if goal is not reachable.
+    """
+    if space.size > 255:
+        raise Exception("the grid is too large for batch_astar")
+    if heuristic is None:
+        heuristic = Manhattan(space, goal)
+    if stats is not None:
+        stats.start("batch_astar")
+        heuristic = TimedHeuristic(heuristic, stats)
+    size, swap_count = space.size, len(space.swaps)
+    # permutations[k] gives the cells of a state in the order of its child by the k-th swap
+    permutations = np.tile(np.arange(size), (swap_count, 1))
+    for k, (a, b) in enumerate(space.swaps):
+        permutations[k, a], permutations[k, b] = b, a
+    counter = count()
+    g_score = {start: 0}
+    parents = {start: None}
+    moves = None
+    heap = []
+    if sorted(start) == sorted(goal):
+        parity = permutation_parity(start, goal)
+        heap = [(parity_bound(heuristic(start), parity), 0, next(counter), start)]
+
+    while heap and moves is None:
+        batch = []
+        while heap and len(batch) < batch_size:
+            entry = heappop(heap)
+            g, state = -entry[1], entry[3]
+            if g != g_score[state]:
+                # An outdated entry: the state was reached again with a smaller g
+                continue
+            if state == goal:
+                if not batch:
+                    moves = rebuild_moves(space, parents, state)
+                else:
+                    heappush(heap, entry)
+                break
+            if budget is not None:
+                budget.spend()
+            if stats is not None:
+                stats.expand(g, len(heap))
+            batch.append((g, state))
+        if not batch:
+            continue
+        states = np.frombuffer(b"".join(state for _, state in batch), dtype=np.uint8).reshape(len(batch), size)
+        children = states[:, permutations].reshape(-1, size)
+        depths = np.repeat([g + 1 for g, _ in batch], swap_count)
+        # h rounded up to the parity of the number of swaps left (see astar)
+        h = np.ceil(heuristic.batch(children)).astype(np.int64)
+        f = (depths + h + ((h - parity - depths) & 1)).tolist()
+        blob = children.tobytes()
+        for i in range(len(children)):
+            child = blob[i*size:(i + 1)*size]
+            g, state = batch[i // swap_count]
+            if g + 1 >= g_score.get(child, inf):
+                continue
+            g_score[child] = g + 1
+            parents[child] = (state, i % swap_count)
+            heappush(heap, (f[i], -(g + 1), next(counter), child))
+    if stats is not None:
+        # as in astar, the children that were not pushed are the duplicates
+        stats.generated = stats.expanded*swap_count
+        stats.duplicates = stats.generated - max(next(counter) - 1, 0)
+        stats.finish(len(g_score), start, None if moves is None else len(moves))
+    return moves
+
+
+def weighted_astar(space, start, goal, weight, heuristic=None, budget=None, stats=None):
+    """
+    Finds a sequence of swaps from start to goal with weighted A* (f = g + w*h, see astar), at most weight times longer than a shortest one.
+    If stats (a stats.SearchStats) is given, it is filled by astar.
+
+    Output:
+    -------
+    moves: list[tuple[tuple[int]]] | None
+        The swaps in the format [((i1, j1), (i2, j2)), ...]. None if goal is not reachable.
+    bound: float
+        The suboptimality bound achieved: len(moves) is at most bound times the length of a shortest solution. 
+        It is the smallest of weight and len(moves)/h(start), h(start) being a lower bound of this length.
+    """
+    if heuristic is None:
+        heuristic = Manhattan(space, goal)
+    moves = astar(space, start, goal, heuristic, weight, budget=budget, stats=stats)
+    if moves is None:
+        return None, weight
+    h_start = heuristic(start)
+    return moves, min(weight, len(moves)/h_start) if h_start > 0 else 1
+
+
+def focal_search(space, start, goal, weight, heuristic=None, budget=None, stats=None):
+    """
+    Finds a sequence of swaps from start to goal at most weight times longer than a shortest one, with focal search (A*_epsilon).
+
+    The open states are stored in buckets by f = g + h. The smallest f, f_min, is a lower bound of the length of a shortest solution.
+    The focal list is made of the open states with f <= weight*f_min, and among them the state with the smallest h 
+    (the closest to goal) is expanded. A state reached again with a smaller g is reopened, so f_min remains a lower bound.
+
+    Parameters:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    start: bytes | tuple[int]
+        The initial state
+    goal: bytes | tuple[int]
+        The state to reach
+    weight: float
+        The suboptimality bound, at least 1.
+    heuristic: function, optional
+        An admissible heuristic towards goal. Default is Manhattan(space, goal).
+    budget: Budget, optional
+        Limits the search. BudgetExhausted is raised when it is exceeded.
+    stats: SearchStats, optional
+        Filled with the statistics of the search (see the stats module).
+
+    Output:
+    -------
+    moves: list[tuple[tuple[int]]] | None
+        The swaps in the format [((i1, j1), (i2, j2)), ...]. None if goal is not reachable.
+    bound: float
+        The suboptimality bound achieved, len(moves)/f_min when the solution is found (at most weight).
+    """
+    if heuristic is None:
+        heuristic = Manhattan(space, goal)
+    if stats is not None:
+        stats.start("focal_search")
+        heuristic = TimedHeuristic(heuristic, stats)
+    update = getattr(heuristic, "update", None)
+    swaps = space.swaps
+    counter = count()
+    g_score = {start: 0}
+    parents = {start: None}
+    h_start = heuristic(start)
+    # buckets[f] is a heap of (h, counter, g, state) for the open states with g + h = f
+    buckets = {h_start: [(h_start, next(counter), 0, start)]}
+    # the number of entries in the buckets
+    waiting = 1
+    moves, bound = None, weight
+
+    while buckets:
+        f_min = min(buckets)
+        # The focal state with the smallest h, ties broken by order of insertion
+        f = min((f for f in buckets if f <= weight*f_min), key=lambda f: buckets[f][0][:2])
+        h, _, g, state = heappop(buckets[f])
+        waiting -= 1
+        if not buckets[f]:
+            del buckets[f]
+        if g != g_score[state]:
+            # An outdated entry: the state was reached again with a smaller g
+            continue
+        if state == goal:
+            moves = rebuild_moves(space, parents, state)
+            bound = len(moves)/f_min if f_min > 0 else 1
+            break
+        if budget is not None:
+            budget.spend()
+        if stats is not None:
+            stats.expand(g, waiting)
+        for k, child in space.neighbors(state):
+            if g + 1 >= g_score.get(child, inf):
+                continue
+            g_score[child] = g + 1
+            parents[child] = (state, k)
+            h_child = update(h, state, *swaps[k]) if update else heuristic(child)
+            heappush(buckets.setdefault(g + 1 + h_child, []), (h_child, next(counter), g + 1, child))
+            waiting += 1
+    if stats is not None:
+        stats.generated = stats.expanded*len(swaps)
+        stats.duplicates = stats.generated - (next(counter) - 1)
+        stats.finish(len(g_score), start, None if moves is None else len(moves))
+    return moves, bound
+
+
+def anytime_search(space, start, goal, moves, heuristic=None, weights=(3, 2, 1.5, 1.25, 1), budget=None):
+    """
+    Improves a known solution until the budget is exhausted. 
+
+    Weighted A* searches are run with decreasing weights, each one only looking for solutions shorter than 
+    the best one found so far (its length is used to prune the states). The last weight is 1, so when the last search
+    ends without being interrupted, the best solution is a shortest one.
+
+    Parameters:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    start: bytes | tuple[int]
+        The initial state
+    goal: bytes | tuple[int]
+        The state to reach
+    moves: list[tuple[tuple[int]]]
+        A known solution, e.g. from Solver.get_solution
+    heuristic: function, optional
+        An admissible and consistent heuristic towards goal. Default is Manhattan(space, goal).
+    weights: tuple[float], optional
+        The weights of the successive searches. They should decrease down to 1.
+    budget: Budget, optional
+        Limits the searches. Default is no limit.
+
+    Output:
+    -------
+    Iterates over the successively shorter solutions, starting with moves itself.
+    No search is run if moves is as short as analysis.lower_bound.
+    """
+    if heuristic is None:
+        heuristic = Manhattan(space, goal)
+    yield moves
+    if len(moves) <= lower_bound(space, start, goal):
+        return
+    best = moves
+    for weight in weights:
+        try:
+            moves = astar(space, start, goal, heuristic, weight, len(best), budget)
+        except BudgetExhausted:
+            return
+        if moves is not None:
+            best = moves
+            yield moves
+
+
+def ida_star(space, start, goal, heuristic=None, budget=None, stats=None):
+    """
+    Finds a shortest sequence of swaps from start to goal with the IDA* algorithm (iterative deepening A*).
+
+    Depth-first searches are run with an increasing bound on f = g + h, each new bound being the smallest f
+    that exceeded the previous one. A single state is swapped and unswapped in place, and only the current path is stored,
+    so the memory is proportional to the length of the solution. 
+    The swap that undoes the previous one is never tried, and two swaps of disjoint cells commute, 
+    so they are only tried in increasing order of index.
+    The parity of the number of swaps left is known (see astar), so h is rounded up to it and the bounds increase by 2.
+
+    Parameters:
+    -----------
+    space: StateSpace
+        The state space of the grid
+    start: bytes | tuple[int]
+        The initial state
+    goal: bytes | tuple[int]
+        The state to reach
+    heuristic: function, optional
+        An admissible heuristic towards goal, which accepts a list of cell values. Default is Manhattan(space, goal).
+        If it has an update method (see the heuristics module), it is updated at each swap instead of recomputed.
+    budget: Budget, optional
+        Limits the search. BudgetExhausted is raised when it is exceeded.
+    stats: SearchStats, optional
+        Filled with the statistics of the search (see the stats module). The states are counted at each iteration,
+        and the frontier is the current path.
+
+    Output:
+    -------
+    moves: list[tuple[tuple[int]]] | None
+        The swaps in the format [((i1, j1), (i2, j2)), ...]. None if goal is not reachable.
+    """
+    if heuristic is None:
+        heuristic = Manhattan(space, goal)
+    if stats is not None:
+        stats.start("ida_star")
+        heuristic = TimedHeuristic(heuristic, stats)
+    update = getattr(heuristic, "update", None)
+    state = list(start)
+    goal = list(goal)
+    swaps = space.swaps
+    # allowed[last] lists the swaps that can follow the swap last (allowed[-1] is used for the first swap)
+    allowed = [[k for k, (a, b) in enumerate(swaps) if k > last or (k < last and {a, b} & set(swaps[last]))] for last in range(len(swaps))]
+    allowed.append(list(range(len(swaps))))
+    path = []
+
+    def search(g, h, bound, last):
+        """
+        Explores the states below the current one (whose heuristic is h) whose f does not exceed bound. 
+        Returns True if goal was found (path then leads to it), else the smallest f above bound.
+        """
+        f = g + parity_bound(h, (parity + g) % 2)
+        if f > bound:
+            return f
+        if state == goal:
+            return True
+        if budget is not None:
+            budget.spend()
+        if stats is not None:
+            stats.expand(g, len(path))
+            stats.generated += len(allowed[last])
+        minimum = inf
+        for k in allowed[last]:
+            a, b = swaps[k]
+            h_child = update(h, state, a, b) if update else None
+            state[a], state[b] = state[b], state[a]
+            path.append(k)
+            result = search(g + 1, heuristic(state) if h_child is None else h_child, bound, k)
+            if result is True:
+                return True
+            path.pop()
+            state[a], state[b] = state[b], state[a]
+            minimum = min(minimum, result)
+        return minimum
+
+    moves = None
+    if sorted(start) == sorted(goal):
+        parity = permutation_parity(start, goal)
+        h = heuristic(state)
+        bound = parity_bound(h, parity)
+        while bound < inf:
+            result = search(0, h, bound, -1)
+            if result is True:
+                moves = [space.moves[k] for k in path]
+                break
+            bound = result
+    if stats is not None:
+        # only the current path is stored
+        stats.finish(len(path) + 1, start, None if moves is None else len(moves))
+    return moves
@@ -1,4 +1,7 @@
 from grid import Grid
+from heuristics import HEURISTICS
+from search import anytime_search, Budget
+from state import get_space
 
 class Solver(): 
     """
@@ -9,91 +12,86 @@ class Solver():
 
 
 
-    def get_solution(self):
+    def get_solution(self, stats=None):
         """
         Solves the grid and returns the sequence of swaps at the format 
         [((i1, j1), (i2, j2)), ((i1', j1'), (i2', j2')), ...]. 
-        """
-        big_list_moves = [] # a list which will contain all moves
+        The grid is sorted at the end.
+        If stats (a stats.SearchStats) is given, it is filled with the number of tiles placed (expanded), 
+        of swaps (generated) and the time.
 
+        The tiles are placed one after the other in increasing order. The tile k is first moved along its line 
+        to the column where it should be, then up along this column to its cell. All the cells it goes through come 
+        after its own cell (line by line), so the tiles already placed are never moved.
+        A list position (value -> flat index of its cell) is updated at each swap, so finding a tile is O(1): 
+        each tile takes at most m + n swaps and the complexity is O(mn(m+n)).
+        """
+        if stats is not None:
+            stats.start("greedy")
+        grid = self.grid
+        m, n = grid.m, grid.n
+        # The grid flattened line by line, and the position of each value in it
+        cells = [value for line in grid.state for value in line]
+        position = [0]*(m*n + 1)
+        for k, value in enumerate(cells):
+            position[value] = k
+        list_moves = []
 
-        # 1. Find the position of an element
-        def find_element(element, grid):
-            for i in range(grid.m):
-                for j in range(grid.n):
-                    if grid.state[i][j] == element:
-                        return (i, j) # return the coordinates of the element
-        #traverses the entire grid of size nm so the complexity is O(mn)"
+        def swap(k1, k2):
+            """Swaps the cells of flat indices k1 and k2 and records the move."""
+            value1, value2 = cells[k1], cells[k2]
+            cells[k1], cells[k2] = value2, value1
+            position[value1], position[value2] = k2, k1
+            list_moves.append(((k1//n, k1%n), (k2//n, k2%n)))
 
+        for value in range(1, m*n + 1):
+            target = value - 1 # The numbers start at 1
+            k = position[value]
+            # 1. Shift the element in its line to the right column
+            while k%n != target%n:
+                step = 1 if k%n < target%n else -1
+                swap(k, k + step)
+                k += step
+            # 2. Bring it up to the right line
+            while k != target:
+                swap(k, k - n)
+                k -= n
 
-        # 2. For each line, give it the elements it should contain
-        def align_element_in_line(grid, line_index, current_column, shift, list_moves = []):
-            """We shift the column of an element in some line recursively
-            Input:
-            - line: the list of elements in the line. Is obtained with grid.state[i]
-            - current_column: index of the element to be shifted in the list
-            - shift: the shift to be applied
-            - list_moves: should be left blank. Used as an argument for the recursion
-            Output:
-            - The list of moves performed.
-            """
-            line = grid.state[line_index] # state of a line at the beginning
-            if shift == 0:
-                return list_moves
-            else:
-                if shift >= 1: #shift the element to the right
-                    line[current_column], line[current_column + 1] = line[current_column + 1], line[current_column]
-                    list_moves.append(((line_index, current_column),(line_index, current_column + 1)))
-                    return align_element_in_line(grid, line_index, current_column + 1, shift - 1, list_moves)
-                if shift <= -1: # shift the element to the left
-                    line[current_column-1], line[current_column] = line[current_column], line[current_column-1]
-                    list_moves.append(((line_index, current_column),(line_index, current_column - 1)))
-                    return align_element_in_line(grid, line, current_column - 1, shift + 1, list_moves)
-            # the complexity is O(n)
+        for i in range(m):
+            grid.state[i][:] = cells[i*n:(i+1)*n]
+        if stats is not None:
+            stats.expanded = m*n
+            stats.generated = len(list_moves)
+            stats.finish(0, cells, len(list_moves))
+        return list_moves
 
-        def get_elements_for_line(grid, line_index):
-            """Brings the elements [line*self.grid.n, ... (line+1)*self.grid.n - 1] on the line line_index."""
-            big_list_moves = []
-            # The line has elements [line_index*self.grid.n, ... (line_index+1)*self.grid.n - 1]
-            list_elements = list(range(line_index*grid.n+1, (line_index+1)*grid.n+1)) # The numbers start at 1
-            #  All elements that are supposed to be on this line/
-            for element in list_elements:
-                # Find where it is.
-                l_good, c_good = find_element(element, grid)
-                if l_good != line_index:
-                    # Look for a column in line line_index that contains a bad element
-                    for column, element in enumerate(grid.state[line_index]):
-                        if not element in list_elements:
-                            c_bad = column
-                            break # Get out of the for loop when we find one.
-                    # Now we have the column of a bad element in line_index. Move the element at position i, j to position i, column_bad_element.
-                    big_list_moves += align_element_in_line(grid, l_good, c_good, c_bad-c_good)
-                    if l_good > line_index:
-                        sign = -1
-                    else:
-                        sign = 1
-                    list_moves = [((l,c_bad),(l+sign, c_bad)) for l in range(l_good, line_index, sign)]
-                    grid.swap_seq(list_moves)
-                    big_list_moves += list_moves
-            return big_list_moves
-        """"
-        This function correctly places all elements that need to be in a given row. For each element, it could potentially call find_element (complexity O(mn)) and then perform a move (complexity O(n)). Executed for n elements per line and for m lines, the complexity of this method is O(m**2 n**2).
+    def iter_solutions(self, time_limit=None, node_limit=None, heuristic="manhattan"):
         """
+        Iterates over successively shorter solutions of the grid, in the format of get_solution. 
+        The first one is the greedy solution of get_solution, it is returned immediately. 
+        Then it is improved by weighted A* searches until the time or node limit (see search.anytime_search). 
+        The last solution is a shortest one if the limits were not reached. The grid is not modified.
 
-        # Now put all elements in the right lines:
-        for line_index in range(self.grid.m):
-            big_list_moves += get_elements_for_line(self.grid, line_index)
-        
-        def sort_all_lines(grid):
-            list_moves = []
-            for i in range(self.grid.m):
-                for j in range(self.grid.n-1):
-                    if grid.state[i][j] > grid.state[i][j+1]:
-                        list_moves.append(((i,j),(i,j+1)))
-                        grid.state[i][j], grid.state[i][j+1] = grid.state[i][j+1], grid.state[i][j]
-            return list_moves
-
-        while not self.grid.is_sorted():
-            big_list_moves += sort_all_lines(self.grid)
+        Parameters: 
+        -----------
+        time_limit: float, optional
+            Time limit for the improvement in seconds. Default is no limit.
+        node_limit: int, optional
+            Maximal number of states expanded for the improvement. Default is no limit.
+        heuristic: str, optional
+            The heuristic used by the searches, a key of heuristics.HEURISTICS. Default is "manhattan".
+        """
+        grid = self.grid
+        space = get_space(grid.m, grid.n)
+        start = grid.to_state()
+        moves = Solver(Grid.from_state(grid.m, grid.n, start)).get_solution()
+        budget = Budget(time_limit, node_limit)
+        yield from anytime_search(space, start, space.goal, moves, HEURISTICS[heuristic](space, space.goal), budget=budget)
 
-        return big_list_moves
+    def get_anytime_solution(self, time_limit=1.0, node_limit=None, heuristic="manhattan"):
+        """
+        Returns the shortest solution found by iter_solutions within the limits. The grid is not modified.
+        """
+        for moves in self.iter_solutions(time_limit, node_limit, heuristic):
+            pass
+        return moves
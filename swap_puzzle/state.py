@@ -0,0 +1,145 @@
+"""
+This is the state module. It contains a compact encoding of the grid states used by the search algorithms.
+"""
+
+from functools import lru_cache
+
+
+class StateSpace:
+    """
+    A class describing the states of an m x n swap puzzle in a compact form.
+
+    A state is the grid flattened line by line: the cell (i, j) is stored at index i*n + j.
+    It is a bytes object when the grid has at most 255 cells (a tuple of integers otherwise),
+    so it is hashable, cheap to compare and uses one byte per cell.
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    size: int
+        Number of cells in the grid, m*n
+    swaps: list[tuple[int, int]]
+        All the allowed swaps as pairs of flat indices (a, b) with a < b.
+        Horizontal swaps come first, then vertical swaps.
+    moves: list[tuple[tuple[int]]]
+        The same swaps in the format ((i1, j1), (i2, j2)) used by Grid.swap.
+    goal: bytes | tuple[int]
+        The sorted state.
+    goal_lines: list[list[int]]
+        The sorted state in the format of Grid.state, so that checking if a grid is sorted is a single comparison.
+    """
+
+    def __init__(self, m, n):
+        """
+        Initializes the state space and precomputes the list of adjacent transpositions.
+
+        Parameters:
+        -----------
+        m: int
+            Number of lines in the grid
+        n: int
+            Number of columns in the grid
+        """
+        self.m = m
+        self.n = n
+        self.size = m*n
+        self.moves = [((i, j), (i, j+1)) for i in range(m) for j in range(n-1)] + [((i, j), (i+1, j)) for i in range(m-1) for j in range(n)]
+        self.swaps = [(i1*n + j1, i2*n + j2) for (i1, j1), (i2, j2) in self.moves]
+        self.goal = self.pack(range(1, self.size + 1))
+        self.goal_lines = self.decode(self.goal)
+        # distance[k][v-1] is the Manhattan distance between the cell k and the cell where v should be
+        self.distance = [[abs(k//n - v//n) + abs(k%n - v%n) for v in range(self.size)] for k in range(self.size)]
+
+    def __repr__(self):
+        """
+        Returns a representation of the state space with number of rows and columns.
+        """
+        return f"<state.StateSpace: m={self.m}, n={self.n}>"
+
+    def pack(self, values):
+        """
+        Builds a state from the flat sequence of the cell values.
+        """
+        if self.size <= 255:
+            return bytes(values)
+        return tuple(values)
+
+    def encode(self, rows):
+        """
+        Encodes a grid state given as a list of lines (list[list[int]] or tuple of tuples).
+        """
+        return self.pack([value for line in rows for value in line])
+
+    def decode(self, state):
+        """
+        Returns the grid state as a list of lines, in the format of Grid.state.
+        """
+        n = self.n
+        return [list(state[i*n:(i+1)*n]) for i in range(self.m)]
+
+    def to_tuple(self, state):
+        """
+        Returns the grid state as a tuple of tuples, in the format of Grid.make_hashable.
+        """
+        n = self.n
+        return tuple(tuple(state[i*n:(i+1)*n]) for i in range(self.m))
+
+    def swap(self, state, k):
+        """
+        Returns the state obtained by applying the k-th swap of self.swaps to state.
+        """
+        a, b = self.swaps[k]
+        # a < b, so the state can be rebuilt by slicing without any copy of a list
+        return state[:a] + state[b:b+1] + state[a+1:b] + state[a:a+1] + state[b+1:]
+
+    def neighbors(self, state):
+        """
+        Iterates over the neighbors of a state. Each undirected swap is generated once.
+
+        Output:
+        -------
+        Pairs (k, neighbor) where k is the index of the swap in self.swaps.
+        """
+        for k in range(len(self.swaps)):
+            yield k, self.swap(state, k)
+
+    def is_goal(self, state):
+        """
+        Checks if the state is the sorted state.
+        """
+        return state == self.goal
+
+
+def rebuild_path(parents, state):
+    """
+    Rebuilds the path from the root of a search to state.
+
+    Parameters:
+    -----------
+    parents: dict
+        Maps every reached state to the state it was reached from (None for the root).
+    state: NodeType
+        The last state of the path.
+
+    Output:
+    -------
+    path: list[NodeType]
+        The states from the root to state.
+    """
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    path.reverse()
+    return path
+
+
+@lru_cache(maxsize=None)
+def get_space(m, n):
+    """
+    Returns the (shared) StateSpace of the m x n grids.
+    """
+    return StateSpace(m, n)
@@ -0,0 +1,193 @@
+"""
+This is the stats module. It records how much work a search did, to compare the algorithms and size the workers.
+
+A SearchStats is passed to a search with its stats parameter (Graph.bfs, Grid.bfs_bis, Grid.bfs_ter, Solver.get_solution, 
+the searches of the search module and parallel.parallel_bfs).
+The search fills it, then calls finish, which sends it to the callback and appends it to the json log if they are given.
+"""
+
+import json
+import sys
+import time
+
+
+class SearchStats:
+    """
+    The statistics of one search.
+
+    Attributes:
+    -----------
+    algorithm: str
+        The name of the search.
+    expanded: int
+        Number of states expanded (whose neighbors were generated).
+    generated: int
+        Number of neighbors generated.
+    duplicates: int
+        Number of generated neighbors dropped because they were already reached (or pruned).
+    max_frontier: int
+        Largest size of the queue, heap or stack of states waiting to be expanded.
+    visited: int
+        Number of states stored at the end of the search.
+    memory: int
+        Estimate in bytes of the memory used by the visited states and the frontier (see estimate_memory).
+    depth_counts: dict[int, int]
+        depth_counts[d] is the number of states expanded at depth d.
+    heuristic_time: float
+        Time spent in the heuristic, in seconds.
+    time: float
+        Total time of the search, in seconds.
+    solution_length: int | None
+        Number of swaps of the solution found, None if no solution was found.
+    """
+
+    # approximate size in bytes of a dictionary entry, and of a frontier entry (pointer and tuple of the heap)
+    dict_entry_bytes = 50
+    frontier_entry_bytes = 80
+
+    def __init__(self, callback=None, log_file=None):
+        """
+        Parameters:
+        -----------
+        callback: function, optional
+            Called with the SearchStats at the end of the search.
+        log_file: str, optional
+            File to which the statistics are appended as one json line at the end of the search.
+        """
+        self.callback = callback
+        self.log_file = log_file
+        self.algorithm = None
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.max_frontier = 0
+        self.visited = 0
+        self.memory = 0
+        self.depth_counts = {}
+        self.heuristic_time = 0.0
+        self.time = 0.0
+        self.solution_length = None
+        self.start_time = None
+
+    def __repr__(self):
+        """
+        Returns a representation of the statistics with the main counters.
+        """
+        return (f"<stats.SearchStats: {self.algorithm}, expanded={self.expanded}, generated={self.generated}, "
+                f"visited={self.visited}, time={self.time:.4f}>")
+
+    def start(self, algorithm):
+        """
+        Starts the timer of the search called algorithm.
+        """
+        self.algorithm = algorithm
+        self.start_time = time.perf_counter()
+
+    def expand(self, depth, frontier, count=1):
+        """
+        Counts count states expanded at depth (one by default), while frontier states are waiting.
+        """
+        self.expanded += count
+        self.depth_counts[depth] = self.depth_counts.get(depth, 0) + count
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+
+    def finish(self, visited, state, solution_length):
+        """
+        Ends the search: stops the timer, estimates the memory and sends the statistics to the callback and to the log.
+
+        Parameters:
+        -----------
+        visited: int
+            Number of states stored by the search.
+        state: object
+            A state of the search, to estimate the size of the stored states.
+        solution_length: int | None
+            Number of swaps of the solution, None if no solution was found.
+        """
+        self.time = time.perf_counter() - self.start_time
+        self.visited = visited
+        self.memory = self.estimate_memory(state)
+        self.solution_length = solution_length
+        if self.callback is not None:
+            self.callback(self)
+        if self.log_file is not None:
+            with open(self.log_file, "a") as file:
+                file.write(self.to_json() + "\n")
+
+    def estimate_memory(self, state):
+        """
+        Returns an estimate of the memory used by the visited states (each one in a dictionary) and by the largest frontier.
+        """
+        return self.visited*(sys.getsizeof(state) + self.dict_entry_bytes) + self.max_frontier*self.frontier_entry_bytes
+
+    @property
+    def expansion_time(self):
+        """
+        Time of the search spent outside the heuristic, in seconds.
+        """
+        return self.time - self.heuristic_time
+
+    def to_dict(self):
+        """
+        Returns the statistics as a dictionary.
+        """
+        return {"algorithm": self.algorithm, "expanded": self.expanded, "generated": self.generated,
+                "duplicates": self.duplicates, "max_frontier": self.max_frontier, "visited": self.visited,
+                "memory": self.memory, "depth_counts": self.depth_counts, "heuristic_time": self.heuristic_time,
+                "expansion_time": self.expansion_time, "time": self.time, "solution_length": self.solution_length}
+
+    def to_json(self):
+        """
+        Returns the statistics as a json string.
+        """
+        return json.dumps(self.to_dict())
+
+
+class TimedHeuristic:
+    """
+    Wraps a heuristic (and its update and batch methods, if any) to add the time spent in it to SearchStats.heuristic_time.
+    """
+
+    def __init__(self, heuristic, stats):
+        """
+        Parameters:
+        -----------
+        heuristic: function
+            The heuristic to time
+        stats: SearchStats
+            The statistics of the search
+        """
+        self.heuristic = heuristic
+        self.stats = stats
+        if hasattr(heuristic, "update"):
+            self.update = self.timed_update
+        if hasattr(heuristic, "batch"):
+            self.batch = self.timed_batch
+
+    def __call__(self, state):
+        """
+        Returns the value of the heuristic on state.
+        """
+        start_time = time.perf_counter()
+        h = self.heuristic(state)
+        self.stats.heuristic_time += time.perf_counter() - start_time
+        return h
+
+    def timed_update(self, h, state, a, b):
+        """
+        Returns the value of the heuristic after swapping the cells a and b of state (see heuristics.Manhattan.update).
+        """
+        start_time = time.perf_counter()
+        h = self.heuristic.update(h, state, a, b)
+        self.stats.heuristic_time += time.perf_counter() - start_time
+        return h
+
+    def timed_batch(self, states):
+        """
+        Returns the values of the heuristic on many states (see heuristics.Manhattan.batch).
+        """
+        start_time = time.perf_counter()
+        h = self.heuristic.batch(states)
+        self.stats.heuristic_time += time.perf_counter() - start_time
+        return h
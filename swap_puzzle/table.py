@@ -0,0 +1,212 @@
+"""
+This is the table module. It contains the precomputed distances to the sorted grid of all the states of the small grids,
+so their optimal solutions are found by looking up the table instead of searching.
+"""
+
+import json
+import mmap
+import os
+import tempfile
+from functools import lru_cache
+from math import factorial
+import numpy as np
+from ranking import rank, rank_batch
+from state import get_space
+
+
+# The tables of get_distance_table and heuristics.get_pattern_database are saved in this directory: 
+# the one given by the environment variable SWAP_PUZZLE_TABLES, else a cache directory of the user
+TABLE_DIRECTORY = os.environ.get("SWAP_PUZZLE_TABLES") or os.path.join(os.path.expanduser("~"), ".cache", "swap_puzzle")
+
+
+class DistanceTable:
+    """
+    The distance to the sorted grid of every state of an m x n grid, with a swap leading to a closer state.
+
+    The tables are computed by a BFS from the sorted grid (the swaps are reversible, so the distance from the sorted grid
+    is the distance to it). They are indexed by the rank of the states (see ranking.rank) and use one byte per state,
+    so they are only built for grids of at most max_size cells (9! states).
+
+    Attributes:
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    distances: bytearray | memoryview
+        distances[rank] is the number of swaps needed to sort the state of this rank.
+    moves: bytearray | memoryview
+        moves[rank] is the index in StateSpace.swaps of a swap that brings the state of this rank closer to the sorted grid
+        (255 for the sorted grid).
+    """
+
+    max_size = 9
+
+    def __init__(self, m, n, distances, moves):
+        """
+        Initializes the table from its arrays. Use DistanceTable.build or DistanceTable.load to get them.
+        """
+        self.m = m
+        self.n = n
+        self.distances = distances
+        self.moves = moves
+
+    def __repr__(self):
+        """
+        Returns a representation of the table with number of rows and columns.
+        """
+        return f"<table.DistanceTable: m={self.m}, n={self.n}>"
+
+    @classmethod
+    def build(cls, m, n):
+        """
+        Computes the table of the m x n grids by BFS from the sorted grid.
+        """
+        space = get_space(m, n)
+        if space.size > cls.max_size:
+            raise Exception("the grid is too large for a distance table")
+        count = factorial(space.size)
+        # The table of the distances is also the visited set: 255 marks the states not reached yet
+        distances = np.full(count, 255, dtype=np.uint8)
+        moves = np.full(count, 255, dtype=np.uint8)
+        distances[rank(space.goal)] = 0
+        frontier = np.frombuffer(space.goal, dtype=np.uint8)[None, :]
+        depth = 0
+        while len(frontier):
+            depth += 1
+            new_states = []
+            for k, (a, b) in enumerate(space.swaps):
+                children = frontier.copy()
+                children[:, [a, b]] = children[:, [b, a]]
+                ranks = rank_batch(children)
+                new = distances[ranks] == 255
+                ranks, first = np.unique(ranks[new], return_index=True)
+                distances[ranks] = depth
+                # a swap is its own inverse
+                moves[ranks] = k
+                new_states.append(children[new][first])
+            frontier = np.concatenate(new_states)
+        distances, moves = bytearray(distances.tobytes()), bytearray(moves.tobytes())
+        return cls(m, n, distances, moves)
+
+    def save(self, file_name):
+        """
+        Writes the table to a file (see write_atomic): a line with the header in json, followed by the raw distances and moves.
+        """
+        write_atomic(file_name, [json.dumps({"m": self.m, "n": self.n}).encode() + b"\n", self.distances, self.moves])
+
+    @classmethod
+    def load(cls, file_name, m=None, n=None):
+        """
+        Loads a table written by save (see map_file). The file is memory-mapped, so the table is not read in memory at once.
+        """
+        data, header, offset = map_file(file_name, m, n)
+        count = factorial(header["m"]*header["n"])
+        if len(data) != offset + 2*count:
+            raise Exception("Format incorrect")
+        view = memoryview(data)
+        return cls(header["m"], header["n"], view[offset:offset + count], view[offset + count:])
+
+    def distance(self, state):
+        """
+        Returns the number of swaps needed to sort state.
+        """
+        return self.distances[rank(state)]
+
+    def path(self, state):
+        """
+        Returns the states of a shortest path from state to the sorted grid, in O(depth) lookups.
+        """
+        space = get_space(self.m, self.n)
+        path = [state]
+        while state != space.goal:
+            state = space.swap(state, self.moves[rank(state)])
+            path.append(state)
+        return path
+
+    def solve(self, state):
+        """
+        Returns a shortest list of swaps sorting state, in the format [((i1, j1), (i2, j2)), ...].
+        """
+        space = get_space(self.m, self.n)
+        solution = []
+        while state != space.goal:
+            k = self.moves[rank(state)]
+            solution.append(space.moves[k])
+            state = space.swap(state, k)
+        return solution
+
+
+def write_atomic(file_name, chunks):
+    """
+    Writes the chunks (bytes-like objects) to file_name. They are written to a temporary file of the same directory,
+    which then replaces file_name at once, so another process never reads a partially written file.
+    """
+    descriptor, temp_name = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(file_name) + ".",
+                                             dir=os.path.dirname(os.path.abspath(file_name)))
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(temp_name, file_name)
+    except BaseException:
+        os.remove(temp_name)
+        raise
+
+
+def map_file(file_name, m=None, n=None):
+    """
+    Memory-maps a file written by DistanceTable.save or heuristics.PatternDatabase.save and reads its header line.
+    Raises an exception if the file has no header, or if the header is not the one of the m x n grids (when they are given).
+
+    Output:
+    -------
+    data: mmap.mmap
+        The whole file, read-only.
+    header: dict
+        The header, with at least the keys m and n.
+    offset: int
+        The position of the data following the header.
+    """
+    with open(file_name, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise Exception("Format incorrect")
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    offset = data.find(b"\n") + 1
+    if offset == 0:
+        raise Exception("Format incorrect")
+    header = json.loads(data[:offset])
+    if (m is not None and header["m"] != m) or (n is not None and header["n"] != n):
+        raise Exception(f"{file_name} is the table of the {header['m']} x {header['n']} grids, not {m} x {n}")
+    return data, header, offset
+
+
+def load_or_build(cls, m, n, prefix):
+    """
+    Returns the table of the m x n grids of class cls (DistanceTable or heuristics.PatternDatabase). It is loaded from 
+    the file prefix_mxn.bin of TABLE_DIRECTORY if it was already computed, otherwise it is built and saved there.
+    """
+    file_name = os.path.join(TABLE_DIRECTORY, f"{prefix}_{m}x{n}.bin")
+    if os.path.exists(file_name):
+        try:
+            return cls.load(file_name, m, n)
+        except Exception:
+            # a corrupted file, or a file of another version: it is replaced below
+            pass
+    table = cls.build(m, n)
+    try:
+        os.makedirs(TABLE_DIRECTORY, exist_ok=True)
+        table.save(file_name)
+    except OSError:
+        # the table is still usable if the directory is read-only
+        pass
+    return table
+
+
+@lru_cache(maxsize=None)
+def get_distance_table(m, n):
+    """
+    Returns the (shared) DistanceTable of the m x n grids. It is loaded from TABLE_DIRECTORY if it was already computed,
+    otherwise it is built and saved there (see load_or_build).
+    """
+    return load_or_build(DistanceTable, m, n, "distances")
@@ -0,0 +1,152 @@
+"""
+This is the visited module. It contains visited sets using one bit per state, indexed by the rank of the states (see the ranking module),
+for the exhaustive searches whose sets of states would not fit in memory.
+"""
+
+import mmap
+from math import factorial
+from ranking import rank
+
+
+class Bitset:
+    """
+    A set of integers in range(count), stored as a bitset in a bytearray, or in a memory-mapped file
+    when it is larger than the memory.
+
+    Attributes:
+    -----------
+    count: int
+        The integers of the set are in range(count).
+    bits: bytearray | mmap.mmap
+        The bit i % 8 of bits[i // 8] is set if i is in the set.
+    """
+
+    def __init__(self, count, file_name=None):
+        """
+        Parameters:
+        -----------
+        count: int
+            The integers of the set are in range(count).
+        file_name: str, optional
+            The file in which the bitset is memory-mapped (it is overwritten). Default is a bytearray in memory.
+        """
+        self.count = count
+        self.file = None
+        self.length = 0
+        nbytes = (count + 7)//8
+        if file_name is None:
+            self.bits = bytearray(nbytes)
+        else:
+            self.file = open(file_name, "w+b")
+            self.file.truncate(nbytes)
+            self.bits = mmap.mmap(self.file.fileno(), nbytes)
+
+    def __repr__(self):
+        """
+        Returns a representation of the bitset with its number of elements.
+        """
+        return f"<visited.Bitset: {self.length} of {self.count}>"
+
+    def __len__(self):
+        """
+        Returns the number of elements of the set.
+        """
+        return self.length
+
+    def __contains__(self, index):
+        """
+        Checks if index is in the set.
+        """
+        return self.bits[index >> 3] >> (index & 7) & 1 == 1
+
+    def add(self, index):
+        """
+        Adds index to the set. Returns True if it was not in the set.
+        """
+        byte, bit = index >> 3, 1 << (index & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.length += 1
+        return True
+
+    @property
+    def nbytes(self):
+        """
+        The memory used by the bits.
+        """
+        return len(self.bits)
+
+    def close(self):
+        """
+        Releases the memory-mapped file, if any.
+        """
+        if self.file is not None:
+            self.bits.close()
+            self.file.close()
+            self.file = None
+
+
+class StateSet:
+    """
+    A set of states of a grid (bytes, tuples or lists of cell values), stored as the Bitset of their ranks.
+    It can replace the set of the visited states of a search: (m*n)! bits are used whatever the number of states,
+    e.g. 60 MB for the 3 x 4 grids.
+
+    Attributes:
+    -----------
+    bitset: Bitset
+        The ranks of the states of the set.
+    """
+
+    # the bitset takes 60 MB in memory for 12 cells (12!/8 bytes), 
+    # and the ranks of the grids of more than 20 cells do not fit in 64 bits
+    max_memory_size = 12
+    max_file_size = 20
+
+    def __init__(self, space, file_name=None):
+        """
+        Parameters:
+        -----------
+        space: StateSpace
+            The state space of the grid
+        file_name: str, optional
+            The file in which the bitset is memory-mapped. Default is in memory, 
+            which is only allowed for the grids of at most max_memory_size cells.
+        """
+        if space.size > self.max_file_size:
+            raise Exception(f"a StateSet of a grid of {space.size} cells would need {factorial(space.size)//8} bytes")
+        if file_name is None and space.size > self.max_memory_size:
+            raise Exception(f"a StateSet of a grid of {space.size} cells would need {factorial(space.size)//8} bytes, "
+                            "give a file_name to memory-map it")
+        self.bitset = Bitset(factorial(space.size), file_name)
+
+    def __repr__(self):
+        """
+        Returns a representation of the set with its number of states.
+        """
+        return f"<visited.StateSet: {len(self.bitset)} states>"
+
+    def __len__(self):
+        """
+        Returns the number of states of the set.
+        """
+        return len(self.bitset)
+
+    def __contains__(self, state):
+        """
+        Checks if state is in the set.
+        """
+        return rank(state) in self.bitset
+
+    def add(self, state):
+        """
+        Adds state to the set. Returns True if it was not in the set.
+        """
+        return self.bitset.add(rank(state))
+
+    def close(self):
+        """
+        Releases the memory-mapped file, if any.
+        """
+        self.bitset.close()
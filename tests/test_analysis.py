@@ -0,0 +1,64 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import tempfile
+import unittest 
+from grid import Grid
+from analysis import count_inversions, parity_bound
+from solver import Solver
+import table
+
+
+def setUpModule():
+    # the tables are saved in a temporary directory instead of the cache directory of the user
+    global table_directory, default_table_directory
+    table_directory = tempfile.TemporaryDirectory()
+    default_table_directory = table.TABLE_DIRECTORY
+    table.TABLE_DIRECTORY = table_directory.name
+
+
+def tearDownModule():
+    table.TABLE_DIRECTORY = default_table_directory
+    table_directory.cleanup()
+
+
+class Test_Analysis(unittest.TestCase):
+    def test_inversions(self):
+        random.seed(2)
+        for size in [1, 2, 7, 20]:
+            values = random.sample(range(1, size + 1), size)
+            expected = sum(1 for i in range(size) for j in range(i + 1, size) if values[i] > values[j])
+            self.assertEqual(count_inversions(values), expected)
+
+    def test_grid(self):
+        grid = Grid(2, 3, [[2, 3, 1], [4, 6, 5]])
+        self.assertEqual(grid.inversions(), 3)
+        self.assertEqual(grid.parity(), 1)
+        self.assertEqual(sorted(map(sorted, grid.cycles())), [[(0, 0), (0, 1), (0, 2)], [(1, 1), (1, 2)]])
+        self.assertEqual(Grid(2, 3).cycles(), [])
+
+    def test_parity_bound(self):
+        self.assertEqual(parity_bound(2.5, 1), 3)
+        self.assertEqual(parity_bound(2.5, 0), 4)
+        self.assertEqual(parity_bound(2, 0), 2)
+
+    def test_lower_bound(self):
+        random.seed(4)
+        for _ in range(20):
+            numbers = random.sample(range(1, 10), 9)
+            grid = Grid(3, 3, [numbers[:3], numbers[3:6], numbers[6:]])
+            length = len(grid.find_best_path()) - 1
+            self.assertLessEqual(grid.lower_bound(), length)
+            self.assertEqual(grid.lower_bound() % 2, length % 2)
+            self.assertEqual(grid.parity(), length % 2)
+
+    def test_anytime_skips_search(self):
+        # the greedy solution of a single swap is optimal
+        grid = Grid(3, 3, [[1, 2, 3], [4, 5, 6], [7, 9, 8]])
+        solutions = list(Solver(grid).iter_solutions())
+        self.assertEqual(len(solutions), 1)
+        self.assertEqual(len(solutions[0]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
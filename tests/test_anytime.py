@@ -0,0 +1,34 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import unittest 
+from grid import Grid
+from solver import Solver
+
+
+class Test_Anytime(unittest.TestCase):
+    def test_improves_to_optimal(self):
+        random.seed(5)
+        for _ in range(5):
+            numbers = random.sample(range(1, 10), 9)
+            grid = Grid(3, 3, [numbers[:3], numbers[3:6], numbers[6:]])
+            solutions = list(Solver(grid).iter_solutions())
+            # the grid is not modified
+            self.assertEqual(grid.state, [numbers[:3], numbers[3:6], numbers[6:]])
+            lengths = [len(moves) for moves in solutions]
+            self.assertEqual(lengths, sorted(set(lengths), reverse=True))
+            self.assertEqual(lengths[-1], len(grid.bfs_ter(Grid(3, 3))))
+            for moves in solutions:
+                self.assertTrue(Grid(3, 3, [numbers[:3], numbers[3:6], numbers[6:]]).swap_seq(moves).is_sorted())
+
+    def test_budget(self):
+        grid = Grid.grid_from_file("input/grid4.in")
+        greedy = Solver(Grid.grid_from_file("input/grid4.in")).get_solution()
+        self.assertEqual(Solver(grid).get_anytime_solution(node_limit=0), greedy)
+        moves = Solver(grid).get_anytime_solution(time_limit=0.5)
+        self.assertLessEqual(len(moves), len(greedy))
+        self.assertTrue(grid.swap_seq(moves).is_sorted())
+
+if __name__ == '__main__':
+    unittest.main()
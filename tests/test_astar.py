@@ -0,0 +1,36 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import unittest 
+from grid import Grid
+from search import astar
+from state import get_space
+
+
+class Test_Astar(unittest.TestCase):
+    def test_optimal(self):
+        random.seed(0)
+        for _ in range(10):
+            numbers = random.sample(range(1, 7), 6)
+            grid = Grid(2, 3, [numbers[:3], numbers[3:]])
+            target = Grid(2, 3)
+            path = grid.bfs_ter(target)
+            # same length as the BFS path, and it really sorts the grid
+            self.assertEqual(len(path), len(grid.bfs_bis(target)) - 1)
+            self.assertTrue(grid.swap_seq(path).is_sorted())
+
+    def test_any_destination(self):
+        space = get_space(3, 3)
+        start = Grid.grid_from_file("input/grid2.in").to_state()
+        goal = space.swap(space.swap(space.goal, 0), 11)
+        path = astar(space, start, goal)
+        grid = Grid.from_state(3, 3, start).swap_seq(path)
+        self.assertEqual(grid.to_state(), goal)
+
+    def test_grid4(self):
+        grid = Grid.grid_from_file("input/grid4.in")
+        self.assertEqual(len(grid.bfs_ter(Grid(4, 4))), 14)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import unittest 
+from batch import grids_from_directory, solve_batch
+from grid import Grid
+
+
+class Test_Batch(unittest.TestCase):
+    def test_directory(self):
+        grids = list(grids_from_directory("input"))
+        self.assertEqual(len(grids), 5)
+        results = list(solve_batch(grids, "astar", workers=2, chunksize=2))
+        self.assertEqual(sorted(result["index"] for result in results), list(range(5)))
+        for result in results:
+            grid = grids[result["index"]]
+            self.assertEqual(result["status"], "solved")
+            self.assertEqual(result["length"], len(grid.bfs_ter(Grid(grid.m, grid.n))))
+
+    def test_many_grids(self):
+        random.seed(7)
+        grids = []
+        for _ in range(100):
+            numbers = random.sample(range(1, 7), 6)
+            grids.append(Grid(2, 3, [numbers[:3], numbers[3:]]))
+        results = list(solve_batch(iter(grids), "greedy", workers=2, chunksize=8))
+        self.assertEqual(len(results), 100)
+        for result in results:
+            grid = grids[result["index"]]
+            self.assertTrue(Grid(2, 3, [line[:] for line in grid.state]).swap_seq(result["moves"]).is_sorted())
+
+    def test_timeout(self):
+        grid = Grid.grid_from_file("input/grid4.in")
+        for algorithm in ["astar", "ida_star"]:
+            result, = solve_batch([grid], algorithm, timeout=0, workers=1)
+            self.assertEqual(result["status"], "timeout")
+        result, = solve_batch([grid], "anytime", timeout=0, workers=1)
+        self.assertEqual(result["status"], "solved")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import unittest 
+import numpy as np
+from grid import Grid
+from heuristics import Manhattan, Misplaced
+from search import astar, batch_astar
+from state import get_space
+
+
+class Test_BatchHeuristics(unittest.TestCase):
+    def test_batch(self):
+        random.seed(6)
+        space = get_space(3, 4)
+        goal = space.pack(random.sample(range(1, 13), 12))
+        states = np.array([random.sample(range(1, 13), 12) for _ in range(50)], dtype=np.uint8)
+        for heuristic in [Manhattan(space, goal), Misplaced(space, goal)]:
+            self.assertEqual(heuristic.batch(states).tolist(), [heuristic(bytes(state)) for state in states])
+
+    def test_batch_astar(self):
+        random.seed(7)
+        space = get_space(3, 3)
+        for _ in range(10):
+            start = space.pack(random.sample(range(1, 10), 9))
+            moves = batch_astar(space, start, space.goal, batch_size=8)
+            self.assertEqual(len(moves), len(astar(space, start, space.goal)))
+            grid = Grid.from_state(3, 3, start)
+            self.assertTrue(grid.swap_seq(moves).is_sorted())
+        self.assertEqual(batch_astar(space, space.goal, space.goal), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import csv
+import json
+import os
+import random
+import tempfile
+import unittest 
+from benchmark import compare, run_benchmark, scrambled_grid, write_csv, write_json
+import table
+
+
+def setUpModule():
+    # the tables are saved in a temporary directory instead of the cache directory of the user
+    global table_directory, default_table_directory
+    table_directory = tempfile.TemporaryDirectory()
+    default_table_directory = table.TABLE_DIRECTORY
+    table.TABLE_DIRECTORY = table_directory.name
+
+
+def tearDownModule():
+    table.TABLE_DIRECTORY = default_table_directory
+    table_directory.cleanup()
+
+
+class Test_Benchmark(unittest.TestCase):
+    def test_scrambled_grid(self):
+        grid = scrambled_grid(3, 4, 6, random.Random(1))
+        self.assertEqual(grid.state, scrambled_grid(3, 4, 6, random.Random(1)).state)
+        self.assertLessEqual(len(grid.bfs_ter(type(grid)(3, 4))), 6)
+
+    def test_run(self):
+        results = run_benchmark([(2, 3), (3, 4)], [4, None], count=2, engines=["greedy", "bfs_bis", "bfs_ter"], time_limit=5)
+        self.assertEqual(len(results), 2*2*2*3)
+        for run in results:
+            if run["engine"] == "bfs_bis" and run["shape"] == "3x4":
+                self.assertEqual(run["status"], "skipped")
+            else:
+                self.assertEqual(run["status"], "solved")
+                self.assertGreaterEqual(run["ratio"], 1)
+            if run["engine"] == "bfs_ter":
+                self.assertEqual(run["length"], run["optimal"])
+        # the same grids give the same lengths
+        again = run_benchmark([(2, 3), (3, 4)], [4, None], count=2, engines=["greedy", "bfs_bis", "bfs_ter"], time_limit=5)
+        self.assertEqual([run["length"] for run in again], [run["length"] for run in results])
+        with tempfile.TemporaryDirectory() as directory:
+            write_csv(results, os.path.join(directory, "bench.csv"))
+            write_json(results, os.path.join(directory, "bench.json"))
+            with open(os.path.join(directory, "bench.csv")) as file:
+                self.assertEqual(len(list(csv.DictReader(file))), len(results))
+            with open(os.path.join(directory, "bench.json")) as file:
+                self.assertEqual(json.load(file), results)
+
+    def test_compare(self):
+        baseline = [{"shape": "3x4", "depth": 4, "index": 0, "engine": "bfs_ter", "status": "solved", "time": 0.1, "nodes": 100, "length": 4}]
+        same = [dict(baseline[0], time=0.12)]
+        self.assertEqual(compare(same, baseline), [])
+        slower = [dict(baseline[0], time=0.2, nodes=200, length=6)]
+        self.assertEqual(len(compare(slower, baseline)), 3)
+        timeout = [dict(baseline[0], status="timeout", length=None)]
+        self.assertEqual(len(compare(timeout, baseline)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from graph import Graph
+
+
+class Test_BfsPathOut(unittest.TestCase):
+    def check_file(self, name):
+        graph = Graph.graph_from_file(f"input/{name}.in")
+        with open(f"input/{name}.path.out", "r") as file:
+            for line in file:
+                # Each line is "src dst distance [path]" or "src dst None"
+                src, dst, rest = line.split(" ", 2)
+                path = graph.bfs(int(src), int(dst))
+                if rest.strip() == "None":
+                    self.assertIsNone(path)
+                else:
+                    distance, expected_path = rest.split(" ", 1)
+                    self.assertEqual(list(path), eval(expected_path))
+                    self.assertEqual(len(path) - 1, int(distance))
+
+    def test_graph1(self):
+        self.check_file("graph1")
+
+    def test_graph2(self):
+        self.check_file("graph2")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import tempfile
+import unittest 
+from grid import Grid
+import table
+
+
+def setUpModule():
+    # the tables are saved in a temporary directory instead of the cache directory of the user
+    global table_directory, default_table_directory
+    table_directory = tempfile.TemporaryDirectory()
+    default_table_directory = table.TABLE_DIRECTORY
+    table.TABLE_DIRECTORY = table_directory.name
+
+
+def tearDownModule():
+    table.TABLE_DIRECTORY = default_table_directory
+    table_directory.cleanup()
+
+
+class Test_Bidirectional(unittest.TestCase):
+    def test_same_length_as_bfs(self):
+        random.seed(2)
+        for _ in range(10):
+            numbers = random.sample(range(1, 10), 9)
+            grid = Grid(3, 3, [numbers[:3], numbers[3:6], numbers[6:]])
+            numbers = random.sample(range(1, 10), 9)
+            dst = Grid(3, 3, [numbers[:3], numbers[3:6], numbers[6:]])
+            path = grid.bfs_bis(dst, bidirectional=True)
+            self.assertEqual(len(path), len(grid.bfs_ter(dst)) + 1)
+            self.assertEqual(path[0], grid.make_hashable())
+            self.assertEqual(path[-1], dst.make_hashable())
+            # consecutive states differ by one swap
+            for state, next_state in zip(path, path[1:]):
+                differences = [(i, j) for i in range(3) for j in range(3) if state[i][j] != next_state[i][j]]
+                self.assertEqual(len(differences), 2)
+
+    def test_find_best_path(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        self.assertEqual(len(grid.find_best_path(bidirectional=True)), len(grid.find_best_path()))
+        self.assertEqual(Grid(2, 2).find_best_path(bidirectional=True), (((1, 2), (3, 4)),))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import unittest 
+from grid import Grid
+
+
+class Test_BoundedSearch(unittest.TestCase):
+    def test_bound(self):
+        random.seed(6)
+        for _ in range(5):
+            numbers = random.sample(range(1, 13), 12)
+            grid = Grid(3, 4, [numbers[:4], numbers[4:8], numbers[8:]])
+            optimal = len(grid.bfs_ter(Grid(3, 4)))
+            for mode in ["weighted", "focal"]:
+                for bound in [1, 1.5, 3]:
+                    path, achieved_bound = grid.bounded_search(Grid(3, 4), bound, mode)
+                    self.assertLessEqual(achieved_bound, bound)
+                    self.assertLessEqual(len(path), achieved_bound*optimal + 1e-9)
+                    self.assertTrue(Grid(3, 4, [numbers[:4], numbers[4:8], numbers[8:]]).swap_seq(path).is_sorted())
+
+    def test_sorted(self):
+        self.assertEqual(Grid(2, 2).bounded_search(Grid(2, 2), 2, "focal"), ([], 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import os
+import tempfile
+import unittest 
+from grid import Grid
+from cache import SolutionCache
+
+
+class Test_Cache(unittest.TestCase):
+    def test_memory(self):
+        cache = SolutionCache(capacity=2)
+        grid = Grid.grid_from_file("input/grid1.in")
+        moves = cache.solve(grid, "bfs_ter")
+        self.assertEqual(len(moves), len(grid.bfs_ter(Grid(grid.m, grid.n))))
+        self.assertEqual(cache.solve(grid, "bfs_ter"), moves)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # the least recently used solution is evicted
+        cache.solve(Grid.grid_from_file("input/grid2.in"), "bfs_ter")
+        cache.solve(Grid.grid_from_file("input/grid3.in"), "greedy")
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(grid, "bfs_ter"))
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "solutions.sqlite")
+            grid = Grid.grid_from_file("input/grid2.in")
+            cache = SolutionCache(file_name=file_name)
+            moves = cache.solve(grid, "ida_star")
+            cache.close()
+            cache = SolutionCache(file_name=file_name)
+            self.assertEqual(cache.get(grid, "ida_star"), moves)
+            self.assertIsNone(cache.get(grid, "bfs_ter"))
+            cache.close()
+            # nothing is kept on disk above max_disk_size
+            cache = SolutionCache(file_name=file_name, max_disk_size=0)
+            cache.put(grid, "bfs_ter", moves)
+            self.assertEqual(cache.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0], 0)
+            cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from graph import Graph
+
+
+class Test_CSRGraph(unittest.TestCase):
+    def test_same_as_graph(self):
+        for name in ["graph1", "graph2"]:
+            graph = Graph.graph_from_file(f"input/{name}.in")
+            csr = graph.compile()
+            self.assertEqual(csr.nb_nodes, graph.nb_nodes)
+            self.assertEqual(len(csr.targets), 2*graph.nb_edges)
+            for node in graph.nodes:
+                self.assertEqual(csr.neighbors(node), graph.graph[node])
+                for other in graph.nodes:
+                    self.assertEqual(csr.bfs(node, other), graph.bfs(node, other))
+
+    def test_distances(self):
+        graph = Graph([1, 2, 3, 4])
+        graph.add_edge(1, 2)
+        graph.add_edge(2, 3)
+        csr = graph.compile()
+        self.assertEqual(list(csr.distances(1)), [0, 1, 2, -1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import os
+import random
+import tempfile
+import unittest 
+from grid import Grid
+from state import get_space
+from table import DistanceTable, load_or_build
+import table as table_module
+
+
+def setUpModule():
+    # the tables are saved in a temporary directory instead of the cache directory of the user
+    global table_directory, default_table_directory
+    table_directory = tempfile.TemporaryDirectory()
+    default_table_directory = table_module.TABLE_DIRECTORY
+    table_module.TABLE_DIRECTORY = table_directory.name
+
+
+def tearDownModule():
+    table_module.TABLE_DIRECTORY = default_table_directory
+    table_directory.cleanup()
+
+
+class Test_DistanceTable(unittest.TestCase):
+    def test_optimal(self):
+        random.seed(3)
+        space = get_space(2, 3)
+        table = DistanceTable.build(2, 3)
+        self.assertEqual(max(table.distances), 9)
+        for _ in range(20):
+            numbers = random.sample(range(1, 7), 6)
+            grid = Grid(2, 3, [numbers[:3], numbers[3:]])
+            moves = table.solve(space.pack(numbers))
+            self.assertEqual(len(moves), table.distance(space.pack(numbers)))
+            self.assertEqual(len(moves), len(grid.bfs_ter(Grid(2, 3))))
+            self.assertTrue(grid.swap_seq(moves).is_sorted())
+
+    def test_save_load(self):
+        table = DistanceTable.build(2, 3)
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "distances.bin")
+            table.save(file_name)
+            loaded = DistanceTable.load(file_name)
+            self.assertEqual((loaded.m, loaded.n), (2, 3))
+            self.assertEqual(bytes(loaded.distances), bytes(table.distances))
+            self.assertEqual(bytes(loaded.moves), bytes(table.moves))
+            del loaded
+
+    def test_load_errors(self):
+        table = DistanceTable.build(2, 2)
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "distances.bin")
+            open(file_name, "wb").close()
+            with self.assertRaises(Exception):
+                DistanceTable.load(file_name)
+            table.save(file_name)
+            # the header must match the requested shape
+            with self.assertRaises(Exception):
+                DistanceTable.load(file_name, 1, 4)
+            self.assertEqual(DistanceTable.load(file_name, 2, 2).m, 2)
+            # save leaves no temporary file
+            self.assertEqual(os.listdir(directory), ["distances.bin"])
+
+    def test_load_or_build(self):
+        default_directory = table_module.TABLE_DIRECTORY
+        with tempfile.TemporaryDirectory() as directory:
+            table_module.TABLE_DIRECTORY = directory
+            try:
+                file_name = os.path.join(directory, "distances_2x2.bin")
+                # an empty file, e.g. left by a process that stopped while writing, is replaced
+                open(file_name, "wb").close()
+                table = load_or_build(DistanceTable, 2, 2, "distances")
+                self.assertEqual(max(table.distances), 4)
+                self.assertEqual(bytes(DistanceTable.load(file_name, 2, 2).distances), bytes(table.distances))
+            finally:
+                table_module.TABLE_DIRECTORY = default_directory
+
+    def test_find_best_path(self):
+        grid = Grid(2, 2, [[4, 3], [2, 1]])
+        path = grid.find_best_path()
+        self.assertEqual(path[0], ((4, 3), (2, 1)))
+        self.assertEqual(path[-1], ((1, 2), (3, 4)))
+        self.assertEqual(len(path) - 1, len(grid.bfs_ter(Grid(2, 2))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import copy
+import random
+import unittest 
+from grid import Grid
+from solver import Solver
+
+
+class Test_GreedySolver(unittest.TestCase):
+    def check(self, m, n):
+        numbers = random.sample(range(1, m*n+1), m*n)
+        state = [numbers[i*n:(i+1)*n] for i in range(m)]
+        grid = Grid(m, n, copy.deepcopy(state))
+        moves = Solver(grid).get_solution()
+        self.assertTrue(grid.is_sorted())
+        # each tile moves at most m + n times
+        self.assertLessEqual(len(moves), m*n*(m+n))
+        # replaying the swaps on the initial grid sorts it
+        self.assertTrue(Grid(m, n, state).swap_seq(moves).is_sorted())
+
+    def test_shapes(self):
+        random.seed(4)
+        for m, n in [(1, 5), (5, 1), (2, 2), (3, 4), (4, 3), (20, 20), (7, 30)]:
+            self.check(m, n)
+
+    def test_sorted(self):
+        self.assertEqual(Solver(Grid(3, 3)).get_solution(), [])
+
+if __name__ == '__main__':
+    unittest.main()
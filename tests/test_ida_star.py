@@ -0,0 +1,30 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import unittest 
+from grid import Grid
+
+
+class Test_IdaStar(unittest.TestCase):
+    def test_same_length_as_astar(self):
+        random.seed(1)
+        for heuristic, m, n in [("manhattan", 3, 3), ("misplaced", 2, 3)]:
+            for _ in range(5):
+                numbers = random.sample(range(1, m*n+1), m*n)
+                grid = Grid(m, n, [numbers[i*n:(i+1)*n] for i in range(m)])
+                path = grid.ida_star(Grid(m, n), heuristic)
+                self.assertEqual(len(path), len(grid.bfs_ter(Grid(m, n))))
+                self.assertTrue(grid.swap_seq(path).is_sorted())
+
+    def test_already_sorted(self):
+        self.assertEqual(Grid(2, 2).ida_star(Grid(2, 2)), [])
+
+    def test_grid4(self):
+        grid = Grid.grid_from_file("input/grid4.in")
+        path = grid.ida_star(Grid(4, 4))
+        self.assertEqual(len(path), 14)
+        self.assertTrue(grid.swap_seq(path).is_sorted())
+
+if __name__ == '__main__':
+    unittest.main()
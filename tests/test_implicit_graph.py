@@ -0,0 +1,44 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import tempfile
+import unittest 
+from grid import Grid
+from graph import Graph, ImplicitGraph
+import table
+
+
+def setUpModule():
+    # the tables are saved in a temporary directory instead of the cache directory of the user
+    global table_directory, default_table_directory
+    table_directory = tempfile.TemporaryDirectory()
+    default_table_directory = table.TABLE_DIRECTORY
+    table.TABLE_DIRECTORY = table_directory.name
+
+
+def tearDownModule():
+    table.TABLE_DIRECTORY = default_table_directory
+    table_directory.cleanup()
+
+
+class Test_ImplicitGraph(unittest.TestCase):
+    def test_bfs(self):
+        # integers, each one linked to its double and to its successor
+        graph = ImplicitGraph(lambda k: [2*k, k+1], [1])
+        self.assertEqual(graph.bfs(1, 10), (1, 2, 4, 5, 10))
+        self.assertEqual(graph.bfs(3, 3), [3])
+
+    def test_unreachable(self):
+        graph = Graph([1, 2, 3])
+        graph.add_edge(1, 2)
+        self.assertIsNone(graph.bfs(1, 3))
+
+    def test_find_best_path(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        best_path = grid.find_best_path()
+        self.assertEqual(len(best_path), 5)
+        self.assertEqual(best_path[0], grid.make_hashable())
+        self.assertEqual(best_path[-1], ((1, 2, 3), (4, 5, 6), (7, 8, 9)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import unittest 
+from grid import Grid
+from heuristics import Manhattan, Misplaced
+from state import get_space
+
+
+class Test_IncrementalHeuristics(unittest.TestCase):
+    def test_same_as_grid(self):
+        grid = Grid(2, 2, [[1, 3], [2, 4]])
+        self.assertEqual(grid.heuristique1(), 2)
+        self.assertEqual(grid.heuristique0(), 1)
+        grid = Grid(2, 3, [[1, 4, 6], [2, 3, 5]])
+        self.assertEqual(grid.heuristique1(), 4)
+        self.assertEqual(grid.heuristique0(), 2.5)
+
+    def test_update(self):
+        random.seed(3)
+        space = get_space(3, 4)
+        goal = bytes(random.sample(range(1, 13), 12))
+        for heuristic in [Manhattan(space, goal), Misplaced(space, goal)]:
+            state = bytes(random.sample(range(1, 13), 12))
+            h = heuristic(state)
+            for _ in range(50):
+                k = random.randrange(len(space.swaps))
+                h = heuristic.update(h, state, *space.swaps[k])
+                state = space.swap(state, k)
+                self.assertEqual(h, heuristic(state))
+            self.assertEqual(heuristic(goal), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,5 +12,10 @@ class Test_IsSorted(unittest.TestCase):
         grid.swap((3,0), (3,1))
         self.assertEqual(grid.is_sorted(), True)
 
+    def test_tuple_lines(self):
+        self.assertTrue(Grid(2, 2, [(1, 2), (3, 4)]).is_sorted())
+        self.assertTrue(Grid(2, 2, ((1, 2), (3, 4))).is_sorted())
+        self.assertFalse(Grid(2, 2, [(2, 1), (3, 4)]).is_sorted())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,20 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import numpy as np
+from grid import Grid
+
+
+class Test_IsSortedBatch(unittest.TestCase):
+    def test_grid(self):
+        self.assertTrue(Grid(3, 2).is_sorted())
+        self.assertFalse(Grid(2, 2, [[1, 2], [4, 3]]).is_sorted())
+
+    def test_batch(self):
+        states = np.array([[[1, 2], [3, 4]], [[2, 1], [3, 4]], [[1, 2], [3, 4]]])
+        self.assertEqual(Grid.is_sorted_batch(states).tolist(), [True, False, True])
+        self.assertEqual(Grid.is_sorted_batch(states.reshape(3, 4)).tolist(), [True, False, True])
+
+if __name__ == '__main__':
+    unittest.main()
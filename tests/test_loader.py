@@ -0,0 +1,57 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import os
+import tempfile
+import unittest 
+from grid import Grid
+from graph import Graph
+
+
+class Test_Loader(unittest.TestCase):
+    def test_graph_from_file(self):
+        graph = Graph.graph_from_file("input/graph1.in")
+        self.assertEqual(graph.nb_nodes, 20)
+        self.assertEqual(graph.nb_edges, 100)
+        # same adjacency lists as when the edges are added one by one
+        expected = Graph(list(range(1, 21)))
+        for node1, node2 in graph.edges:
+            expected.add_edge(node1, node2)
+        self.assertEqual(graph.graph, expected.graph)
+
+    def test_multi_grid_file(self):
+        grids = [Grid.grid_from_file(f"input/grid{i}.in") for i in range(5)]
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "grids.in")
+            Grid.grids_to_file(grids, file_name)
+            loaded = Grid.grids_from_file(file_name)
+        self.assertEqual([(g.m, g.n, g.state) for g in loaded], [(g.m, g.n, g.state) for g in grids])
+
+    def test_format_incorrect(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "grid.in")
+            with open(file_name, "w") as file:
+                file.write("2 2\n1 2\n3\n")
+            with self.assertRaises(Exception):
+                Grid.grid_from_file(file_name)
+            # the right number of cells, but not n on each line
+            with open(file_name, "w") as file:
+                file.write("2 2\n1 2 3\n4\n")
+            with self.assertRaises(Exception):
+                Grid.grid_from_file(file_name)
+            with open(file_name, "w") as file:
+                file.write("1\n2 2\n1 2 3\n4\n")
+            with self.assertRaises(Exception):
+                Grid.grids_from_file(file_name)
+            with open(file_name, "w") as file:
+                file.write("3 2\n1 2\n2 4\n")
+            with self.assertRaises(Exception):
+                Graph.graph_from_file(file_name)
+            # the right number of values, but not two on each line
+            with open(file_name, "w") as file:
+                file.write("3 2\n1 2 2\n3\n")
+            with self.assertRaises(Exception):
+                Graph.graph_from_file(file_name)
+
+if __name__ == '__main__':
+    unittest.main()
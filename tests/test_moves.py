@@ -0,0 +1,60 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import random
+import unittest 
+import numpy as np
+from grid import Grid
+from moves import apply_batch, first_illegal_move, verify_solutions
+from solver import Solver
+
+
+class Test_Moves(unittest.TestCase):
+    def test_first_illegal_move(self):
+        self.assertIsNone(first_illegal_move(2, 2, []))
+        self.assertIsNone(first_illegal_move(2, 2, [((0, 0), (0, 1)), ((1, 1), (0, 1))]))
+        self.assertEqual(first_illegal_move(2, 2, [((0, 0), (0, 1)), ((0, 0), (1, 1))]), 1)
+        # the cells must be in the grid
+        self.assertEqual(first_illegal_move(2, 2, [((0, 1), (0, 2))]), 0)
+        self.assertEqual(first_illegal_move(2, 2, [((0, 0), (-1, 0))]), 0)
+
+    def test_swap_seq(self):
+        grid = Grid(2, 2, [[1, 2], [3, 4]])
+        with self.assertRaises(Exception):
+            grid.swap_seq([((0, 0), (0, 1)), ((0, 0), (1, 1))])
+        # the grid is not modified by an illegal sequence
+        self.assertEqual(grid.state, [[1, 2], [3, 4]])
+        grid.swap_seq([((0, 0), (0, 1)), ((0, 1), (1, 1))])
+        self.assertEqual(grid.state, [[2, 4], [3, 1]])
+        # the cells are not rounded or cast
+        for moves in ([((0, 0), (0, 1.5))], [((0, 0), (0, True))], [((0, 1), (0, 2))]):
+            with self.assertRaises(Exception):
+                grid.swap_seq(moves)
+        self.assertEqual(grid.state, [[2, 4], [3, 1]])
+        # the NumPy integers are accepted
+        grid.swap_seq(np.array([((0, 0), (0, 1))]))
+        self.assertEqual(grid.state, [[4, 2], [3, 1]])
+
+    def test_verify_solutions(self):
+        random.seed(8)
+        states, sequences = [], []
+        for _ in range(20):
+            numbers = random.sample(range(1, 13), 12)
+            states.append(numbers)
+            sequences.append(Solver(Grid(3, 4, [numbers[:4], numbers[4:8], numbers[8:]])).get_solution())
+        sequences[3] = sequences[3][:-1]
+        sequences[5] = sequences[5][:2] + [((0, 0), (1, 1))] + sequences[5][2:]
+        solved, illegal = verify_solutions(3, 4, np.array(states), sequences)
+        expected = [True]*20
+        expected[3] = expected[5] = False
+        self.assertEqual(solved.tolist(), expected)
+        self.assertEqual(illegal.tolist(), [-1]*5 + [2] + [-1]*14)
+
+    def test_apply_batch(self):
+        states = np.array([[1, 2, 3, 4], [4, 3, 2, 1]])
+        results = apply_batch(states, [[((0, 0), (0, 1))], []], 2)
+        self.assertEqual(results.tolist(), [[2, 1, 3, 4], [4, 3, 2, 1]])
+        self.assertEqual(states.tolist(), [[1, 2, 3, 4], [4, 3, 2, 1]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from collections import deque
+from grid import Grid
+from parallel import ShardedBFS, parallel_bfs, parallel_layer_sizes
+from state import get_space
+
+
+class Test_ParallelBFS(unittest.TestCase):
+    def test_layer_sizes(self):
+        space = get_space(2, 3)
+        # sequential BFS from the sorted grid
+        depths = {space.goal: 0}
+        queue = deque([space.goal])
+        while queue:
+            state = queue.popleft()
+            for _, child in space.neighbors(state):
+                if child not in depths:
+                    depths[child] = depths[state] + 1
+                    queue.append(child)
+        expected = [list(depths.values()).count(d) for d in range(max(depths.values()) + 1)]
+        self.assertEqual(parallel_layer_sizes(space, space.goal, workers=3), expected)
+        self.assertEqual(sum(expected), 720)
+
+    def test_path(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        path = grid.bfs_bis(Grid(3, 3), workers=2)
+        self.assertEqual(len(path), 5)
+        self.assertEqual(path[0], grid.make_hashable())
+        self.assertEqual(path[-1], Grid(3, 3).make_hashable())
+        with self.assertRaises(Exception):
+            grid.bfs_bis(Grid(3, 3), bidirectional=True, workers=2)
+        space = get_space(3, 3)
+        self.assertEqual(parallel_bfs(space, space.goal, space.goal, workers=2), [space.goal])
+        # the search stops at the level of the goal, without expanding it
+        search = ShardedBFS(space, workers=2)
+        path = search.run(grid.to_state(), space.goal)
+        self.assertEqual(len(search.layer_sizes), len(path))
+
+    def test_dead_worker(self):
+        # the workers die on an unhashable goal: the lost connection is reported, not a broken pipe when stopping them
+        space = get_space(2, 2)
+        with self.assertRaises(EOFError):
+            ShardedBFS(space, workers=2).run(space.goal, [1, 2, 3, 4])
+
+if __name__ == '__main__':
+    unittest.main()
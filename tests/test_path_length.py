@@ -1,10 +1,27 @@
 import sys 
 sys.path.append("swap_puzzle/")
 
+import tempfile
 import unittest 
 from grid import Grid
 from graph import Graph
 from solver import Solver
+import table
+
+
+def setUpModule():
+    # the tables are saved in a temporary directory instead of the cache directory of the user
+    global table_directory, default_table_directory
+    table_directory = tempfile.TemporaryDirectory()
+    default_table_directory = table.TABLE_DIRECTORY
+    table.TABLE_DIRECTORY = table_directory.name
+
+
+def tearDownModule():
+    table.TABLE_DIRECTORY = default_table_directory
+    table_directory.cleanup()
+
+
 class TestBestPath(unittest.TestCase):
     def test_find_best_path(self):
         grid = Grid(2, 3 , [[1, 4, 6], [2, 3, 5]])
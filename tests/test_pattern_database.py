@@ -0,0 +1,70 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import os
+import tempfile
+import unittest 
+from collections import deque
+from grid import Grid
+from heuristics import Manhattan, PatternDatabase
+from search import astar, ida_star
+from state import get_space
+import table
+
+
+class Test_PatternDatabase(unittest.TestCase):
+    def test_admissible(self):
+        space = get_space(2, 3)
+        database = PatternDatabase.build(2, 3, [[1, 2, 3], [4, 5, 6]])
+        heuristic = database.heuristic()
+        manhattan = Manhattan(space, space.goal)
+        # distances to the sorted grid by BFS
+        distances = {space.goal: 0}
+        queue = deque([space.goal])
+        while queue:
+            state = queue.popleft()
+            for _, child in space.neighbors(state):
+                if child not in distances:
+                    distances[child] = distances[state] + 1
+                    queue.append(child)
+        self.assertEqual(len(distances), 720)
+        for state, distance in distances.items():
+            self.assertLessEqual(manhattan(state), heuristic(state))
+            self.assertLessEqual(heuristic(state), distance)
+
+    def test_save_load(self):
+        database = PatternDatabase.build(3, 3, [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "grid3x3.pdb")
+            database.save(file_name)
+            loaded = PatternDatabase.load(file_name)
+            self.assertEqual(loaded.patterns, database.patterns)
+            # one byte per placement of the tiles of each pattern: 9*8*7
+            self.assertEqual([len(table) for table in loaded.tables], [504, 504, 504])
+            self.assertEqual([bytes(table) for table in loaded.tables], [bytes(table) for table in database.tables])
+            # the memory-mapped tables can be plugged in the solvers
+            space = get_space(3, 3)
+            start = Grid.grid_from_file("input/grid2.in").to_state()
+            self.assertEqual(len(astar(space, start, space.goal, loaded.heuristic())), 4)
+            self.assertEqual(len(ida_star(space, start, space.goal, loaded.heuristic())), 4)
+            del loaded
+
+    def test_persisted(self):
+        default_directory = table.TABLE_DIRECTORY
+        with tempfile.TemporaryDirectory() as directory:
+            table.TABLE_DIRECTORY = directory
+            try:
+                built = table.load_or_build(PatternDatabase, 2, 3, "patterns")
+                self.assertEqual(os.listdir(directory), ["patterns_2x3.bin"])
+                # the second process maps the saved file instead of building the tables again
+                loaded = table.load_or_build(PatternDatabase, 2, 3, "patterns")
+                self.assertIsInstance(loaded.tables[0], memoryview)
+                self.assertEqual([bytes(t) for t in loaded.tables], [bytes(t) for t in built.tables])
+                with self.assertRaises(Exception):
+                    PatternDatabase.load(os.path.join(directory, "patterns_2x3.bin"), 3, 2)
+                del loaded
+            finally:
+                table.TABLE_DIRECTORY = default_directory
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from ranking import rank_partial
+import numpy as np
+from itertools import permutations
+from grid import Grid, rank, unrank, rank_batch, unrank_batch
+
+
+class Test_Ranking(unittest.TestCase):
+    def test_rank(self):
+        # the ranks follow the lexicographic order
+        states = list(permutations(range(1, 6)))
+        self.assertEqual([rank(state) for state in states], list(range(120)))
+        self.assertEqual([tuple(unrank(index, 5)) for index in range(120)], states)
+
+    def test_rank_partial(self):
+        # the placements of 3 values of range(6) are numbered 0..6*5*4 - 1 in the lexicographic order
+        placements = list(permutations(range(6), 3))
+        self.assertEqual([rank_partial(placement, 6) for placement in placements], list(range(120)))
+        # the placements of all the values are ranked as the states
+        self.assertEqual(rank_partial([4, 0, 2, 1, 3], 5), rank([5, 1, 3, 2, 4]))
+
+    def test_batch(self):
+        states = np.array(list(permutations(range(1, 6))), dtype=np.uint8)
+        self.assertEqual(rank_batch(states).tolist(), list(range(120)))
+        self.assertTrue((unrank_batch(np.arange(120), 5) == states).all())
+        ranks = np.array([0, 12345, 479001599])
+        self.assertEqual(rank_batch(unrank_batch(ranks, 12)).tolist(), ranks.tolist())
+
+    def test_grid(self):
+        grid = Grid(2, 3, [[6, 5, 4], [3, 2, 1]])
+        self.assertEqual(grid.rank(), 719)
+        self.assertEqual(Grid(2, 3).rank(), 0)
+        self.assertEqual(Grid.from_rank(2, 3, 719).state, grid.state)
+
+if __name__ == '__main__':
+    unittest.main()
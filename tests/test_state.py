@@ -0,0 +1,37 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from grid import Grid
+from heuristics import Manhattan
+from state import StateSpace, get_space
+
+
+class Test_State(unittest.TestCase):
+    def test_round_trip(self):
+        grid = Grid.grid_from_file("input/grid1.in")
+        state = grid.to_state()
+        self.assertEqual(state, bytes([1, 2, 3, 4, 5, 6, 8, 7]))
+        self.assertEqual(Grid.from_state(4, 2, state).state, grid.state)
+        self.assertEqual(get_space(4, 2).to_tuple(state), grid.make_hashable())
+
+    def test_neighbors(self):
+        space = StateSpace(2, 3)
+        self.assertEqual(len(space.swaps), 7)
+        neighbors = [space.to_tuple(t) for _, t in space.neighbors(space.goal)]
+        self.assertEqual(len(set(neighbors)), 7)
+        self.assertIn(((2, 1, 3), (4, 5, 6)), neighbors)
+        self.assertIn(((1, 2, 6), (4, 5, 3)), neighbors)
+        # each neighbor is obtained with the corresponding move of Grid.swap
+        for k, t in space.neighbors(space.goal):
+            grid = Grid(2, 3).swap(*space.moves[k])
+            self.assertEqual(grid.to_state(), t)
+
+    def test_large_grid(self):
+        space = get_space(20, 20)
+        self.assertIsInstance(space.goal, tuple)
+        # a swap moves two tiles by one cell, and the heuristic is half the Manhattan distance
+        self.assertEqual(Manhattan(space, space.goal)(space.swap(space.goal, 0)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
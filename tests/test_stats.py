@@ -0,0 +1,82 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import json
+import os
+import tempfile
+import unittest 
+from grid import Grid
+from graph import Graph
+from parallel import parallel_bfs
+from search import batch_astar, bidirectional_bfs, focal_search, ida_star, weighted_astar
+from solver import Solver
+from state import get_space
+from stats import SearchStats
+
+
+class Test_Stats(unittest.TestCase):
+    def test_bfs(self):
+        graph = Graph.graph_from_file("input/graph1.in")
+        stats = SearchStats()
+        path = graph.bfs(1, 20, stats=stats)
+        self.assertEqual(path, graph.bfs(1, 20))
+        self.assertEqual(stats.algorithm, "bfs")
+        self.assertEqual(stats.solution_length, len(path) - 1)
+        self.assertEqual(stats.duplicates, stats.generated - stats.visited + 1)
+        self.assertEqual(sum(stats.depth_counts.values()), stats.expanded)
+
+    def test_bfs_bis(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        stats = SearchStats()
+        path = grid.bfs_bis(Grid(grid.m, grid.n), stats=stats)
+        self.assertEqual(stats.solution_length, len(path) - 1)
+        self.assertEqual(stats.depth_counts[0], 1)
+        self.assertLessEqual(max(stats.depth_counts), len(path) - 1)
+        self.assertGreater(stats.memory, 0)
+
+    def test_bfs_ter(self):
+        grid = Grid.grid_from_file("input/grid4.in")
+        calls = []
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, "stats.jsonl")
+            stats = SearchStats(callback=calls.append, log_file=log_file)
+            moves = grid.bfs_ter(Grid(grid.m, grid.n), stats=stats)
+            with open(log_file) as file:
+                logged = json.loads(file.read())
+        self.assertEqual(calls, [stats])
+        self.assertEqual(logged["algorithm"], "astar")
+        self.assertEqual(logged["solution_length"], len(moves))
+        self.assertEqual(logged["expanded"], stats.expanded)
+        self.assertGreater(stats.heuristic_time, 0)
+        self.assertLessEqual(stats.heuristic_time, stats.time)
+
+    def test_engines(self):
+        space = get_space(3, 3)
+        start = Grid.grid_from_file("input/grid2.in").to_state()
+        engines = {"ida_star": lambda stats: ida_star(space, start, space.goal, stats=stats),
+                   "batch_astar": lambda stats: batch_astar(space, start, space.goal, batch_size=4, stats=stats),
+                   "weighted_astar": lambda stats: weighted_astar(space, start, space.goal, 1.5, stats=stats)[0],
+                   "focal_search": lambda stats: focal_search(space, start, space.goal, 1.5, stats=stats)[0],
+                   "bidirectional_bfs": lambda stats: bidirectional_bfs(space, start, space.goal, stats=stats),
+                   "parallel_bfs": lambda stats: parallel_bfs(space, start, space.goal, workers=2, stats=stats)}
+        for name, engine in engines.items():
+            stats = SearchStats()
+            solution = engine(stats)
+            # the BFS return the states of the path, the other searches the swaps
+            length = len(solution) - 1 if name.endswith("bfs") else len(solution)
+            self.assertEqual(stats.algorithm, name)
+            self.assertEqual(stats.solution_length, length)
+            self.assertGreater(stats.expanded, 0)
+            self.assertEqual(sum(stats.depth_counts.values()), stats.expanded)
+            self.assertGreater(stats.max_frontier, 0)
+            self.assertGreater(stats.memory, 0)
+            self.assertGreaterEqual(stats.generated, stats.duplicates)
+
+    def test_solver(self):
+        stats = SearchStats()
+        moves = Solver(Grid.grid_from_file("input/grid3.in")).get_solution(stats=stats)
+        self.assertEqual(stats.to_dict()["solution_length"], len(moves))
+        self.assertEqual(stats.generated, len(moves))
+
+if __name__ == '__main__':
+    unittest.main()
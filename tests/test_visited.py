@@ -0,0 +1,67 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import os
+import tempfile
+import unittest 
+from grid import Grid
+from search import astar, bfs_layers, Budget, BudgetExhausted
+from state import get_space
+from table import DistanceTable
+from visited import Bitset, StateSet
+
+
+class Test_Visited(unittest.TestCase):
+    def test_bitset(self):
+        bitset = Bitset(100)
+        self.assertEqual(bitset.nbytes, 13)
+        self.assertTrue(bitset.add(99))
+        self.assertFalse(bitset.add(99))
+        self.assertTrue(bitset.add(0))
+        self.assertIn(99, bitset)
+        self.assertNotIn(98, bitset)
+        self.assertEqual(len(bitset), 2)
+
+    def test_mmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            bitset = Bitset(10**6, os.path.join(directory, "visited.bin"))
+            for index in range(0, 10**6, 1000):
+                bitset.add(index)
+            self.assertEqual(len(bitset), 1000)
+            self.assertIn(999000, bitset)
+            self.assertNotIn(999001, bitset)
+            bitset.close()
+
+    def test_state_set(self):
+        space = get_space(2, 3)
+        states = StateSet(space)
+        self.assertTrue(states.add(space.goal))
+        self.assertIn(space.goal, states)
+        self.assertIn([1, 2, 3, 4, 5, 6], states)
+        self.assertNotIn(space.swap(space.goal, 0), states)
+
+    def test_bfs_layers(self):
+        space = get_space(2, 3)
+        table = DistanceTable.build(2, 3)
+        expected = [bytes(table.distances).count(d) for d in range(max(table.distances) + 1)]
+        self.assertEqual(bfs_layers(space, space.goal), expected)
+        self.assertEqual(bfs_layers(space, space.goal, visited=set()), expected)
+
+    def test_large_grids(self):
+        # the bitset of a 4 x 4 grid would need 2.6 TB: bfs_layers uses a set
+        space = get_space(4, 4)
+        with self.assertRaises(BudgetExhausted):
+            bfs_layers(space, space.goal, budget=Budget(node_limit=1000))
+        with self.assertRaises(Exception):
+            StateSet(get_space(2, 7))
+        with self.assertRaises(Exception):
+            StateSet(get_space(3, 7), "visited.bin")
+
+    def test_astar(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        space = get_space(grid.m, grid.n)
+        moves = astar(space, grid.to_state(), space.goal, closed=StateSet(space))
+        self.assertEqual(len(moves), len(grid.bfs_ter(Grid(grid.m, grid.n))))
+
+if __name__ == '__main__':
+    unittest.main()